@@ -17,6 +17,7 @@ import math
 from pathlib import Path
 import json
 from dataclasses import asdict
+from contextlib import nullcontext
 import random
 import os
 import sys
@@ -37,8 +38,8 @@ from config import (
 from Keithley import Keithley2450GateSource, choose_visa_resource, list_visa_resources
 from sweep_plot import SweepPlotter
 from sweep_runner import get_timebase_dt, prepare_instrument, stream_impedance_sweep
-from ui import COL, print_order, print_run_options, settings_dashboard
-from voltage_plan import format_seconds, save_sweep_csv, set_gate_voltage
+from ui import BLUE, GREEN, RED, YELLOW, print_order, print_run_options, settings_dashboard, wrap
+from voltage_plan import StepCsvContext, flush_pending, format_seconds, save_sweep_csv, set_gate_voltage
 
 
 def voltage_list_arg(raw: str) -> List[float]:
@@ -398,6 +399,16 @@ def build_parser(
         action="store_true",
         help="Run a single sweep using the first voltage in the order.",
     )
+    parser.add_argument(
+        "--aggregate-csv",
+        action="store_true",
+        help="Write one CSV per voltage step (all its sweeps) instead of one CSV per sweep.",
+    )
+    parser.add_argument(
+        "--direct-io",
+        action="store_true",
+        help="Write per-sweep CSVs with O_DIRECT, bypassing the page cache (Linux; falls back when unsupported).",
+    )
     parser.add_argument(
         "--reset-defaults",
         action="store_true",
@@ -496,6 +507,7 @@ def run_single_sweep_at_voltage(
     gate_settings: GateSourceSettings,
     status_config: Dict[str, str] | None,
     debug_mode: bool = False,
+    direct_io: bool = False,
 ) -> None:
     set_gate_voltage(voltage, gate_source, tolerance_v=gate_settings.settle_tolerance_v)
     push_status_update(
@@ -534,7 +546,7 @@ def run_single_sweep_at_voltage(
             },
         )
     if debug_mode:
-        print(COL.wrap("[debug] Using synthetic sweep data (no instruments).", COL.yellow))
+        print(wrap("[debug] Using synthetic sweep data (no instruments).", YELLOW))
         sweep_data = _fake_sweep_data(sweep_settings)
     else:
         sweep_data = stream_impedance_sweep(
@@ -557,6 +569,7 @@ def run_single_sweep_at_voltage(
         timebase_dt=get_timebase_dt(),
         sweep_settings=sweep_settings,
         run_id=run_id,
+        direct_io=direct_io,
     )
     if plots_enabled:
         push_plot_update(
@@ -597,6 +610,8 @@ def run_voltage_block(
     gate_settings: GateSourceSettings,
     status_config: Dict[str, str] | None,
     debug_mode: bool = False,
+    aggregate_csv: bool = False,
+    direct_io: bool = False,
 ) -> Dict[str, List[float]] | None:
     set_gate_voltage(voltage, gate_source, tolerance_v=gate_settings.settle_tolerance_v)
     print(
@@ -624,102 +639,106 @@ def run_voltage_block(
 
     send_status(voltage_time_s)
 
-    while True:
-        elapsed = time.time() - start
-        time_left = max(0.0, voltage_time_s - elapsed)
-        if sweep_count > 0 and time_left <= 0:
-            break
-
-        def title_func() -> str:
-            current_elapsed = time.time() - start
-            current_left = max(0.0, voltage_time_s - current_elapsed)
-            return (
-                f"Step {step_index + 1}/{total_steps}  "
-                f"Gate={voltage:g} V  "
-                f"Time left {format_seconds(current_left)}  "
-                f"Order pos {step_index + 1}"
-            )
-
-        sweep_id = f"{run_id}_step{step_index + 1}_sweep{sweep_count + 1}"
-        last_push_len = 0
-
-        def live_plot_cb(real: List[float], imag: List[float]) -> None:
-            nonlocal last_push_len
-            if not plots_enabled:
-                return
-            available = _finite_prefix(real, imag)
-            if available - last_push_len < 5:
-                return
-            last_push_len = available
-            real = real[:available]
-            imag = imag[:available]
-            push_plot_update(
-                status_config.get("url"),
-                status_config.get("password"),
-                {
-                    "session": run_id,
-                    "id": sweep_id,
-                    "label": f"Step {step_index + 1}/{total_steps} sweep {sweep_count + 1} ({voltage:g} V)",
-                    "real": real,
-                    "imag": imag,
-                },
+    step_csv = StepCsvContext(str(output_dir), step_index, voltage, run_id=run_id) if aggregate_csv else nullcontext()
+    with step_csv as step_file:
+        while True:
+            elapsed = time.time() - start
+            time_left = max(0.0, voltage_time_s - elapsed)
+            if sweep_count > 0 and time_left <= 0:
+                break
+
+            def title_func() -> str:
+                current_elapsed = time.time() - start
+                current_left = max(0.0, voltage_time_s - current_elapsed)
+                return (
+                    f"Step {step_index + 1}/{total_steps}  "
+                    f"Gate={voltage:g} V  "
+                    f"Time left {format_seconds(current_left)}  "
+                    f"Order pos {step_index + 1}"
+                )
+
+            sweep_id = f"{run_id}_step{step_index + 1}_sweep{sweep_count + 1}"
+            last_push_len = 0
+
+            def live_plot_cb(real: List[float], imag: List[float]) -> None:
+                nonlocal last_push_len
+                if not plots_enabled:
+                    return
+                available = _finite_prefix(real, imag)
+                if available - last_push_len < 5:
+                    return
+                last_push_len = available
+                real = real[:available]
+                imag = imag[:available]
+                push_plot_update(
+                    status_config.get("url"),
+                    status_config.get("password"),
+                    {
+                        "session": run_id,
+                        "id": sweep_id,
+                        "label": f"Step {step_index + 1}/{total_steps} sweep {sweep_count + 1} ({voltage:g} V)",
+                        "real": real,
+                        "imag": imag,
+                    },
+                )
+            if debug_mode:
+                print(wrap("[debug] Using synthetic sweep data (no instruments).", YELLOW))
+                sweep_data = _fake_sweep_data(sweep_settings)
+            else:
+                sweep_data = stream_impedance_sweep(
+                    daq,
+                    plotter,
+                    prev_data=prev_data,
+                    title_func=title_func,
+                    live_plot_cb=live_plot_cb if plots_enabled else None,
+                )
+            if not sweep_data:
+                print("No data returned from sweeper; stopping this voltage step early.")
+                break
+
+            sweep_count += 1
+            measurement_elapsed = time.time() - measurement_t0
+            save_sweep_csv(
+                voltage=voltage,
+                step_index=step_index,
+                sweep_index=sweep_count,
+                data=sweep_data,
+                measurement_elapsed=measurement_elapsed,
+                output_dir=str(output_dir),
+                timebase_dt=get_timebase_dt(),
+                sweep_settings=sweep_settings,
+                run_id=run_id,
+                step_file=step_file,
+                direct_io=direct_io,
             )
-        if debug_mode:
-            print(COL.wrap("[debug] Using synthetic sweep data (no instruments).", COL.yellow))
-            sweep_data = _fake_sweep_data(sweep_settings)
-        else:
-            sweep_data = stream_impedance_sweep(
-                daq,
-                plotter,
-                prev_data=prev_data,
-                title_func=title_func,
-                live_plot_cb=live_plot_cb if plots_enabled else None,
+            if plots_enabled:
+                push_plot_update(
+                    status_config.get("url") if status_config else None,
+                    status_config.get("password") if status_config else None,
+                    {
+                        "session": run_id,
+                        "id": sweep_id,
+                        "label": f"Step {step_index + 1}/{total_steps} sweep {sweep_count} ({voltage:g} V)",
+                        "real": sweep_data["Re_Z_Ohm"],
+                        "imag": sweep_data["Im_Z_Ohm"],
+                    },
+                )
+            latest_data = sweep_data
+            prev_data = sweep_data
+
+            elapsed = time.time() - start
+            time_left = max(0.0, voltage_time_s - elapsed)
+            print(
+                f"[{step_index + 1}/{total_steps}] "
+                f"V={voltage:g} V | sweep {sweep_count} | "
+                f"time left {format_seconds(time_left)}",
+                end="\r",
+                flush=True,
             )
-        if not sweep_data:
-            print("No data returned from sweeper; stopping this voltage step early.")
-            break
-
-        sweep_count += 1
-        measurement_elapsed = time.time() - measurement_t0
-        save_sweep_csv(
-            voltage=voltage,
-            step_index=step_index,
-            sweep_index=sweep_count,
-            data=sweep_data,
-            measurement_elapsed=measurement_elapsed,
-            output_dir=str(output_dir),
-            timebase_dt=get_timebase_dt(),
-            sweep_settings=sweep_settings,
-            run_id=run_id,
-        )
-        if plots_enabled:
-            push_plot_update(
-                status_config.get("url") if status_config else None,
-                status_config.get("password") if status_config else None,
-                {
-                    "session": run_id,
-                    "id": sweep_id,
-                    "label": f"Step {step_index + 1}/{total_steps} sweep {sweep_count} ({voltage:g} V)",
-                    "real": sweep_data["Re_Z_Ohm"],
-                    "imag": sweep_data["Im_Z_Ohm"],
-                },
-            )
-        latest_data = sweep_data
-        prev_data = sweep_data
-
-        elapsed = time.time() - start
-        time_left = max(0.0, voltage_time_s - elapsed)
-        print(
-            f"[{step_index + 1}/{total_steps}] "
-            f"V={voltage:g} V | sweep {sweep_count} | "
-            f"time left {format_seconds(time_left)}",
-            end="\r",
-            flush=True,
-        )
-        send_status(time_left)
-        if debug_mode:
-            time.sleep(0.6)
-            break
+            send_status(time_left)
+            if debug_mode:
+                time.sleep(0.6)
+                break
     print()
     send_status(0.0)
     return latest_data
@@ -830,6 +849,8 @@ def main() -> None:
     }
     run_config["status_server_url"] = args.status_server_url
     run_config["status_password"] = args.status_server_password
+    run_config["aggregate_csv"] = args.aggregate_csv
+    run_config["direct_io"] = args.direct_io
 
     status_msg = None
     while True:
@@ -853,29 +874,29 @@ def main() -> None:
             break
         if action == "reset":
             settings = InstrumentSettings.reset_to_defaults()
-            status_msg = COL.wrap("Zurich settings reset to defaults.", COL.green)
+            status_msg = wrap("Zurich settings reset to defaults.", GREEN)
             continue
         if action == "list_visa":
             try:
                 resources = list_visa_resources()
                 if resources:
-                    status_msg = COL.wrap("VISA resources: " + ", ".join(resources), COL.green)
+                    status_msg = wrap("VISA resources: " + ", ".join(resources), GREEN)
                 else:
-                    status_msg = COL.wrap("No VISA resources detected.", COL.red)
+                    status_msg = wrap("No VISA resources detected.", RED)
             except Exception as exc:
-                status_msg = COL.wrap(f"VISA query failed: {exc}", COL.red)
+                status_msg = wrap(f"VISA query failed: {exc}", RED)
             continue
         if action == "preview":
             if not run_config.get("enable_live_plot", True):
-                status_msg = COL.wrap("Live plot is disabled.", COL.yellow)
+                status_msg = wrap("Live plot is disabled.", YELLOW)
                 continue
             plotter = SweepPlotter()
             preview_live_plot(plotter)
-            status_msg = COL.wrap("Live plot preview complete.", COL.green)
+            status_msg = wrap("Live plot preview complete.", GREEN)
             continue
         if action == "preview_server":
             if not run_config.get("enable_server_plots", True):
-                status_msg = COL.wrap("Server plots are disabled.", COL.yellow)
+                status_msg = wrap("Server plots are disabled.", YELLOW)
                 continue
             status_config = {
                 "url": run_config.get("status_server_url"),
@@ -883,7 +904,7 @@ def main() -> None:
                 "plots_enabled": True,
             }
             preview_server_plots(status_config)
-            status_msg = COL.wrap("Server plot preview sent.", COL.green)
+            status_msg = wrap("Server plot preview sent.", GREEN)
             continue
 
         try:
@@ -898,7 +919,7 @@ def main() -> None:
             )
             order = [step["voltage"] for step in schedule]
         except ValueError as exc:
-            status_msg = COL.wrap(f"Invalid voltage configuration: {exc}", COL.red)
+            status_msg = wrap(f"Invalid voltage configuration: {exc}", RED)
             continue
 
         timestamp_suffix = time.strftime("%Y%m%d-%H%M%S")
@@ -907,7 +928,7 @@ def main() -> None:
         run_output_dir = base_output_dir / run_id
 
         if run_output_dir.exists():
-            print(COL.wrap(f"Output folder already exists: {run_output_dir}", COL.yellow))
+            print(wrap(f"Output folder already exists: {run_output_dir}", YELLOW))
             choice = input("Create a new folder with a unique timestamp suffix? [Y/n]: ").strip().lower()
             if choice in ("", "y", "yes"):
                 ts_suffix = time.strftime("%Y%m%d-%H%M%S")
@@ -922,9 +943,9 @@ def main() -> None:
         try:
             log_path = run_output_dir / "run.log"
             log_file, original_stdout, original_stderr = start_run_logging(log_path)
-            print(COL.wrap(f"[log] Writing run output to {log_path}", COL.blue))
+            print(wrap(f"[log] Writing run output to {log_path}", BLUE))
             if DEBUG_MODE:
-                print(COL.wrap("[debug] DEBUG=1: skipping instrument connections and using synthetic sweeps.", COL.yellow))
+                print(wrap("[debug] DEBUG=1: skipping instrument connections and using synthetic sweeps.", YELLOW))
 
             print_run_options(
                 options,
@@ -950,7 +971,7 @@ def main() -> None:
                 try:
                     gate_source = connect_gate_source(gate_settings)
                 except Exception as exc:
-                    status_msg = COL.wrap(f"Gate source error: {exc}", COL.red)
+                    status_msg = wrap(f"Gate source error: {exc}", RED)
                     continue
 
             plotter = SweepPlotter() if run_config.get("enable_live_plot", True) else NullPlotter()
@@ -991,8 +1012,9 @@ def main() -> None:
                         gate_settings,
                         status_config,
                         debug_mode=DEBUG_MODE,
+                        direct_io=bool(run_config.get("direct_io")),
                     )
-                    status_msg = COL.wrap("Single sweep finished.", COL.green)
+                    status_msg = wrap("Single sweep finished.", GREEN)
                 else:
                     total_steps = len(schedule)
                     for idx, step in enumerate(schedule):
@@ -1014,18 +1036,24 @@ def main() -> None:
                             gate_settings=gate_settings,
                             status_config={"url": run_config.get("status_server_url"), "password": run_config.get("status_password")},
                             debug_mode=DEBUG_MODE,
+                            aggregate_csv=bool(run_config.get("aggregate_csv")),
+                            direct_io=bool(run_config.get("direct_io")),
                         )
-                    status_msg = COL.wrap("All voltage sweeps completed.", COL.green)
+                    status_msg = wrap("All voltage sweeps completed.", GREEN)
             except KeyboardInterrupt:
-                status_msg = COL.wrap("Measurement interrupted by user.", COL.red)
+                status_msg = wrap("Measurement interrupted by user.", RED)
             except Exception as exc:
-                status_msg = COL.wrap(f"Run failed: {exc}", COL.red)
+                status_msg = wrap(f"Run failed: {exc}", RED)
             finally:
                 try:
                     if gate_source:
                         gate_source.shutdown()
                 except Exception as exc:
-                    print(COL.wrap(f"Gate source shutdown issue: {exc}", COL.yellow))
+                    print(wrap(f"Gate source shutdown issue: {exc}", YELLOW))
+                try:
+                    flush_pending()
+                except Exception as exc:
+                    status_msg = wrap(f"Saving sweep CSVs failed: {exc}", RED)
 
             options.single_sweep = False
             save_state(
@@ -8,13 +8,14 @@ Keithley 2450 helpers for supplying gate voltage.
 
 from __future__ import annotations
 
+import sys
 import time
 from typing import Sequence
 
 import pyvisa
 from pymeasure.instruments.keithley import Keithley2450
 from config import GateSourceSettings
-from ui import COL, clear_screen, read_key
+from ui import BLUE_BOLD, GREEN, YELLOW, raw_mode, read_key, wrap
 
 
 def _ensure_no_errors(smu: Keithley2450, step: str) -> None:
@@ -67,33 +68,37 @@ def choose_visa_resource(resources: Sequence[str]) -> str:
     if not resources:
         raise RuntimeError("No VISA resources detected.")
 
+    title = wrap("Select VISA resource (↑/↓, Enter, q to cancel)", BLUE_BOLD)
     index = 0
-    while True:
-        clear_screen()
-        print(COL.wrap("Select VISA resource (↑/↓, Enter, q to cancel)", COL.blue + COL.bold))
-        for idx, resource in enumerate(resources):
-            prefix = "➜ " if idx == index else "  "
-            label = COL.wrap(resource, COL.green) if idx == index else resource
-            print(prefix + label)
-
-        key = read_key()
-        if key in ("ESC[A", "k"):
-            index = (index - 1) % len(resources)
-        elif key in ("ESC[B", "j"):
-            index = (index + 1) % len(resources)
-        elif key in ("\r", "\n"):
-            return resources[index]
-        elif key in ("q", "\x1b"):
-            raise KeyboardInterrupt("Selection cancelled by user.")
-        else:
-            try:
-                direct = int(key)
-            except ValueError:
-                continue
-            if 0 <= direct < len(resources):
-                index = direct
-            elif 1 <= direct <= len(resources):
-                index = direct - 1
+    with raw_mode(sys.stdin.fileno()):
+        while True:
+            # Clear and repaint the picker with a single write per keypress.
+            frame = ["\033[2J\033[H", title, "\n"]
+            for idx, resource in enumerate(resources):
+                prefix = "➜ " if idx == index else "  "
+                label = wrap(resource, GREEN) if idx == index else resource
+                frame.append(f"{prefix}{label}\n")
+            sys.stdout.write("".join(frame))
+            sys.stdout.flush()
+
+            key = read_key()
+            if key in ("ESC[A", "k"):
+                index = (index - 1) % len(resources)
+            elif key in ("ESC[B", "j"):
+                index = (index + 1) % len(resources)
+            elif key in ("\r", "\n"):
+                return resources[index]
+            elif key in ("q", "\x1b"):
+                raise KeyboardInterrupt("Selection cancelled by user.")
+            else:
+                try:
+                    direct = int(key)
+                except ValueError:
+                    continue
+                if 0 <= direct < len(resources):
+                    index = direct
+                elif 1 <= direct <= len(resources):
+                    index = direct - 1
 
 
 class Keithley2450GateSource:
@@ -171,10 +176,10 @@ class Keithley2450GateSource:
         while abs(last_v - voltage) > tolerance_v:
             if (time.time() - start) > timeout_s:
                 print(
-                    COL.wrap(
+                    wrap(
                         f"Gate source did not reach {voltage:g} V within {tolerance_v:g} V after {timeout_s}s "
                         f"(last {last_v:.4f} V)",
-                        COL.yellow,
+                        YELLOW,
                     )
                 )
                 break
@@ -204,12 +209,12 @@ class Keithley2450GateSource:
                 try:
                     v, _ = self.read_voltage_current()
                 except Exception as exc:  # noqa: BLE001
-                    print(COL.wrap(f"Gate source read during shutdown failed: {exc}", COL.yellow))
+                    print(wrap(f"Gate source read during shutdown failed: {exc}", YELLOW))
                     break
                 if abs(v) < 0.1:
                     break
                 if time.time() - start > 5.0:
-                    print(COL.wrap(f"Gate source did not reach 0 V after 5s (last {v:.4g} V); proceeding.", COL.yellow))
+                    print(wrap(f"Gate source did not reach 0 V after 5s (last {v:.4g} V); proceeding.", YELLOW))
                     break
                 time.sleep(0.25)
 
@@ -217,7 +222,7 @@ class Keithley2450GateSource:
                 smu.shutdown()
                 _ensure_no_errors(smu, "shutdown")
             except Exception as exc:  # noqa: BLE001
-                print(COL.wrap(f"Gate source shutdown command failed: {exc}", COL.yellow))
+                print(wrap(f"Gate source shutdown command failed: {exc}", YELLOW))
         finally:
             try:
                 smu.adapter.close()
@@ -176,23 +176,21 @@ def build_voltage_schedule(
     if zero_time_leading_min is not None and zero_time_leading_min < 0:
         raise ValueError("zero_time_leading_min must be >= 0.")
 
-    def time_for_voltage(idx: int) -> float:
-        return voltage_times[idx] if voltage_times is not None else voltage_time_min
-
-    def time_for_zero(idx: int | None = None, *, leading: bool = False) -> float:
-        if leading:
-            return zero_time_leading_min if zero_time_leading_min is not None else voltage_time_min
-        if zero_times is not None and idx is not None:
-            return zero_times[idx]
-        return voltage_time_min
+    # Resolve defaults once so the loop below is plain indexing.
+    default_times = [voltage_time_min] * len(base_voltages)
+    v_times = voltage_times if voltage_times is not None else default_times
+    z_times = zero_times if zero_times is not None else default_times
+    z_lead = zero_time_leading_min if zero_time_leading_min is not None else voltage_time_min
 
     schedule: List[dict] = []
     if alternate_with_zero:
-        schedule.append({"voltage": 0.0, "time_min": time_for_zero(leading=True), "kind": "leading_zero"})
-
-    for _ in range(repetitions):
-        for idx, voltage in enumerate(base_voltages):
-            schedule.append({"voltage": voltage, "time_min": time_for_voltage(idx), "kind": "voltage"})
-            if alternate_with_zero:
-                schedule.append({"voltage": 0.0, "time_min": time_for_zero(idx), "kind": "zero_after"})
+        schedule.append({"voltage": 0.0, "time_min": z_lead, "kind": "leading_zero"})
+        for _ in range(repetitions):
+            for idx, voltage in enumerate(base_voltages):
+                schedule.append({"voltage": voltage, "time_min": v_times[idx], "kind": "voltage"})
+                schedule.append({"voltage": 0.0, "time_min": z_times[idx], "kind": "zero_after"})
+    else:
+        for _ in range(repetitions):
+            for idx, voltage in enumerate(base_voltages):
+                schedule.append({"voltage": voltage, "time_min": v_times[idx], "kind": "voltage"})
     return schedule
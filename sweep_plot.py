@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Sequence
 
 import matplotlib.pyplot as plt
+import numpy as np
 
 
 class SweepPlotter:
@@ -36,10 +37,40 @@ class SweepPlotter:
         self.ax.set_ylabel("-Im(Z) [Ohm]")
         self.ax.legend()
         self.fig.tight_layout(rect=[0, 0, 1, 0.92])
+        # Data bounds currently covered by the axis limits (None until first data).
+        self._bounds: tuple[float, float, float, float] | None = None
+        self._prev_ref: object = None
 
     def pause(self, seconds: float) -> None:
         plt.pause(seconds)
 
+    @staticmethod
+    def _finite_bounds(xs: np.ndarray, ys: np.ndarray) -> tuple[float, float, float, float] | None:
+        n = min(xs.size, ys.size)
+        xs = xs[:n]
+        ys = ys[:n]
+        mask = np.isfinite(xs) & np.isfinite(ys)
+        if not mask.any():
+            return None
+        xs = xs[mask]
+        ys = ys[mask]
+        return float(xs.min()), float(xs.max()), float(ys.min()), float(ys.max())
+
+    def _update_limits(self, bounds: tuple[float, float, float, float]) -> None:
+        """Grow the axis limits only when the data leaves the covered bounds."""
+        if self._bounds is not None:
+            xmin, xmax, ymin, ymax = self._bounds
+            if bounds[0] >= xmin and bounds[1] <= xmax and bounds[2] >= ymin and bounds[3] <= ymax:
+                return
+            bounds = (min(xmin, bounds[0]), max(xmax, bounds[1]), min(ymin, bounds[2]), max(ymax, bounds[3]))
+        self._bounds = bounds
+        xmin, xmax, ymin, ymax = bounds
+        xmargin, ymargin = self.ax.margins()
+        xpad = (xmax - xmin) * xmargin or max(abs(xmax) * xmargin, 1.0)
+        ypad = (ymax - ymin) * ymargin or max(abs(ymax) * ymargin, 1.0)
+        self.ax.set_xlim(xmin - xpad, xmax + xpad)
+        self.ax.set_ylim(ymin - ypad, ymax + ypad)
+
     def update(
         self,
         real: Sequence[float],
@@ -49,16 +80,35 @@ class SweepPlotter:
         title: str,
     ) -> None:
         # Nyquist view uses -Im(Z)
-        self.line_current.set_data(real, [-v for v in imag])
+        real_arr = np.asarray(real, dtype=float)
+        neg_imag = -np.asarray(imag, dtype=float)
+        self.line_current.set_data(real_arr, neg_imag)
+        bounds = [self._finite_bounds(real_arr, neg_imag)]
+
+        # A new previous sweep means a new sweep started: rescale from scratch.
+        if prev_real is not self._prev_ref:
+            self._prev_ref = prev_real
+            self._bounds = None
 
         if prev_real is not None and prev_imag is not None:
-            self.line_previous.set_data(prev_real, [-v for v in prev_imag])
+            prev_real_arr = np.asarray(prev_real, dtype=float)
+            prev_neg_imag = -np.asarray(prev_imag, dtype=float)
+            self.line_previous.set_data(prev_real_arr, prev_neg_imag)
             self.line_previous.set_visible(True)
+            bounds.append(self._finite_bounds(prev_real_arr, prev_neg_imag))
         else:
             self.line_previous.set_visible(False)
 
-        self.ax.relim()
-        self.ax.autoscale_view()
+        found = [b for b in bounds if b is not None]
+        if found:
+            self._update_limits(
+                (
+                    min(b[0] for b in found),
+                    max(b[1] for b in found),
+                    min(b[2] for b in found),
+                    max(b[3] for b in found),
+                )
+            )
         self.ax.set_title(title)
 
         self.fig.canvas.draw_idle()
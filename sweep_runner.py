@@ -47,7 +47,7 @@ def _to_data_dict(
     imagz: np.ndarray,
     timestamps: Optional[np.ndarray] = None,
     meta: Optional[Dict[str, np.ndarray]] = None,
-) -> Dict[str, list[float]]:
+) -> Dict[str, list[float] | np.ndarray]:
     magnitude = np.sqrt(np.square(realz) + np.square(imagz))
     # Prefer primary timestamps if they align with frequency, else fall back to nexttimestamp.
     time_axis: Optional[np.ndarray] = None
@@ -76,7 +76,8 @@ def _to_data_dict(
     if time_ticks is not None:
         data["time_ticks_raw"] = time_ticks.tolist()
     if time_seconds is not None:
-        data["time_s_raw"] = time_seconds.tolist()
+        # Kept as an ndarray; it is only consumed when writing the sweep CSV.
+        data["time_s_raw"] = time_seconds
         data["time_s_source"] = time_source or "ticks"
     elif time_axis is not None:
         # Fallback: still store ticks if timebase missing.
@@ -153,7 +154,7 @@ def _slice_to_count(
     return realz[:n], imagz[:n]
 
 
-def collect_impedance_sweep(daq) -> Optional[Dict[str, list[float]]]:
+def collect_impedance_sweep(daq) -> Optional[Dict[str, list[float] | np.ndarray]]:
     """
     Run a single impedance sweep and return the parsed data.
     Returns None if no data is produced.
@@ -193,10 +194,10 @@ def collect_impedance_sweep(daq) -> Optional[Dict[str, list[float]]]:
 def stream_impedance_sweep(
     daq,
     plotter,
-    prev_data: Optional[Dict[str, list[float]]],
+    prev_data: Optional[Dict[str, list[float] | np.ndarray]],
     title_func: Callable[[], str],
     live_plot_cb: Optional[Callable[[list[float], list[float]], None]] = None,
-) -> Optional[Dict[str, list[float]]]:
+) -> Optional[Dict[str, list[float] | np.ndarray]]:
     """
     Run one sweep while streaming updates to the live plot.
     Returns the latest sweep data dict (or None if no data).
@@ -1,22 +1,21 @@
 from __future__ import annotations
 
+import shutil
 import sys
 import time
 from pathlib import Path
-import re
 import os
-try:
-    import termios
-    import tty
-except ImportError:  # Windows
-    termios = None
-    tty = None
+import select
 
 try:
     import msvcrt  # type: ignore
 except ImportError:
     msvcrt = None
-from typing import Sequence
+from collections import namedtuple
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Callable, Sequence
 
 from config import (
     ExperimentOptions,
@@ -28,36 +27,106 @@ from config import (
 )
 
 
-class Colors:
-    """Minimal ANSI color helper."""
-
-    def __init__(self) -> None:
-        self.enabled = sys.stdout.isatty()
-        self.blue = "\033[96m" if self.enabled else ""
-        self.green = "\033[92m" if self.enabled else ""
-        self.yellow = "\033[93m" if self.enabled else ""
-        self.red = "\033[91m" if self.enabled else ""
-        self.bold = "\033[1m" if self.enabled else ""
-        self.reset = "\033[0m" if self.enabled else ""
+COLORS_ON = {
+    "blue": "\033[96m",
+    "green": "\033[92m",
+    "yellow": "\033[93m",
+    "red": "\033[91m",
+    "bold": "\033[1m",
+    "reset": "\033[0m",
+    "blue_bold": "\033[96;1m",
+    "yellow_bold": "\033[93;1m",
+}
+COLORS_OFF = {name: "" for name in COLORS_ON}
+
+# Chosen once at import; all modules style with these names and wrap() below.
+COLORS_ENABLED = sys.stdout.isatty()
+_COLORS = COLORS_ON if COLORS_ENABLED else COLORS_OFF
+BLUE = _COLORS["blue"]
+GREEN = _COLORS["green"]
+YELLOW = _COLORS["yellow"]
+RED = _COLORS["red"]
+BOLD = _COLORS["bold"]
+RESET = _COLORS["reset"]
+BLUE_BOLD = _COLORS["blue_bold"]
+YELLOW_BOLD = _COLORS["yellow_bold"]
+
+
+def _is_sgr(code: str) -> bool:
+    """True if `code` is exactly one SGR escape sequence like "\\033[1;96m"."""
+    return code.startswith("\033[") and code.endswith("m") and code[2:-1].replace(";", "").isdigit()
+
+
+@lru_cache(maxsize=256)
+def _wrap(text: str, color: str) -> str:
+    """Cached body of wrap(); labels and headers repeat every frame."""
+    if _is_sgr(color) and text.endswith(RESET):
+        end = text.find("m")
+        if _is_sgr(text[: end + 1]):
+            # Text is already styled: merge parameters into its leading SGR
+            # instead of nesting. The outer style only ever applied up to
+            # the inner reset, so the rendering is unchanged.
+            return f"{color[:-1]};{text[2:end]}m{text[end + 1:]}"
+    return f"{color}{text}{RESET}"
+
+
+def wrap(text: str, color: str) -> str:
+    """Wrap text in an ANSI color from this module (e.g. GREEN) and reset after it."""
+    # Disabled colors are all "", so this also covers non-TTY output.
+    if not color:
+        return text
+    if isinstance(text, str):
+        return _wrap(text, color)
+    return f"{color}{text}{RESET}"
 
-    def wrap(self, text: str, color: str) -> str:
-        return f"{color}{text}{self.reset}" if self.enabled else text
-
-
-COL = Colors()
 HEADER_ART = None
+HEADER_ART_LINES: list[str] | None = None
 UI_VERSION = "v0.0.4"
 UI_VERSION_DATE = "2026-01-16"  # set manually to match the build/version date
 SIDE_PAD = 20  # spaces (~2 tabs) to inset content from both sides
+# Static pieces of print_run_options, styled once at import.
+_RUN_OPTIONS_HEADER = wrap("=== Current measurement setup ===", BLUE_BOLD)
+_RUN_OPTIONS_FOOTER = wrap("===============================", BLUE)
+
+
+def _sgr_spans(text: str):
+    """
+    Yield (start, end) slices of the SGR sequences in `text`, i.e. what
+    \\x1b\\[[0-9;]*m matches, using str.find instead of the regex engine.
+    """
+    pos = 0
+    while True:
+        start = text.find("\x1b[", pos)
+        if start < 0:
+            return
+        end = text.find("m", start + 2)
+        if end < 0:
+            return
+        if text[start + 2 : end].strip("0123456789;"):
+            # Not an SGR sequence (other CSI or stray ESC): look past this ESC.
+            pos = start + 1
+            continue
+        yield start, end + 1
+        pos = end + 1
 
 
 def _visible_len(text: str) -> int:
     """Return printable length by removing ANSI codes."""
-    return len(re.sub(r"\x1b\[[0-9;]*m", "", text))
+    if "\x1b" not in text:
+        return len(text)
+    return len(text) - sum(end - start for start, end in _sgr_spans(text))
 
 
 def _strip_ansi(text: str) -> str:
-    return re.sub(r"\x1b\[[0-9;]*m", "", text)
+    if "\x1b" not in text:
+        return text
+    out = []
+    pos = 0
+    for start, end in _sgr_spans(text):
+        out.append(text[pos:start])
+        pos = end
+    out.append(text[pos:])
+    return "".join(out)
 
 
 def _format_duration(seconds: float) -> str:
@@ -70,21 +139,42 @@ def _format_duration(seconds: float) -> str:
     return f"{mins:02d}m {secs:02d}s"
 
 
+def _schedule_key(options: ExperimentOptions) -> tuple:
+    """Hashable snapshot of the options that determine the voltage schedule."""
+    return (
+        tuple(options.voltages or ()),
+        options.repetitions,
+        options.alternate_with_zero,
+        options.voltage_time_min,
+        None if options.voltage_times_min is None else tuple(options.voltage_times_min),
+        options.zero_time_leading_min,
+        None if options.zero_times_min is None else tuple(options.zero_times_min),
+    )
+
+
+@lru_cache(maxsize=8)
+def _schedule_for_key(key: tuple) -> tuple[tuple[dict, ...], float]:
+    """Build the schedule for a _schedule_key() tuple; returns (steps, total seconds)."""
+    schedule = build_voltage_schedule(*key)
+    total_seconds = sum(step["time_min"] * 60.0 for step in schedule)
+    return tuple(schedule), total_seconds
+
+
+def _schedule(options: ExperimentOptions) -> tuple[tuple[dict, ...], float]:
+    """
+    Cached build_voltage_schedule for the dashboard, which asks for the same
+    schedule every frame. Raises ValueError for invalid options. The returned
+    steps are shared between calls and must not be modified.
+    """
+    return _schedule_for_key(_schedule_key(options))
+
+
 def _estimate_steps_and_time(options: ExperimentOptions) -> tuple[int, float]:
     """Estimate total steps and seconds based on options."""
     try:
-        schedule = build_voltage_schedule(
-            options.voltages,
-            options.repetitions,
-            options.alternate_with_zero,
-            options.voltage_time_min,
-            options.voltage_times_min,
-            options.zero_time_leading_min,
-            options.zero_times_min,
-        )
+        schedule, total_seconds = _schedule(options)
     except ValueError:
         return 0, 0.0
-    total_seconds = sum(step["time_min"] * 60.0 for step in schedule)
     return len(schedule), total_seconds
 
 
@@ -97,9 +187,9 @@ def _highlight_hotkeys(chunks: list[str]) -> str:
     is_hotkey = False
     for part in chunks:
         if is_hotkey:
-            out.append(COL.wrap(part, COL.yellow + COL.bold))
+            out.append(wrap(part, YELLOW_BOLD))
         else:
-            out.append(COL.wrap(part, COL.blue + COL.bold))
+            out.append(wrap(part, BLUE_BOLD))
         is_hotkey = not is_hotkey
     return "".join(out)
 
@@ -110,19 +200,32 @@ def _header_bounds(lines: list[str]) -> tuple[int, int]:
     across all lines (after stripping ANSI). Returns (left, right); if no
     content exists, returns (0, -1).
     """
-    left = float("inf")
+    left = -1
     right = -1
     for line in lines:
-        clean = _strip_ansi(line).rstrip("\n")
-        if not clean.strip():
+        clean = _strip_ansi(line)
+        # One scan for the first/last non-space column, no temporary strings.
+        first = last = -1
+        for i, c in enumerate(clean):
+            if c not in " \n":
+                if first < 0:
+                    first = i
+                last = i
+        if last < 0 or clean.isspace():
             continue
-        first = len(clean) - len(clean.lstrip(" "))
-        last = len(clean.rstrip(" ")) - 1
-        left = min(left, first)
-        right = max(right, last)
+        if left < 0 or first < left:
+            left = first
+        if last > right:
+            right = last
     if right < 0:
         return 0, -1
-    return int(left), int(right)
+    return left, right
+
+
+@lru_cache(maxsize=4)
+def _header_art_bounds(header_art: str) -> tuple[int, int]:
+    """_header_bounds of the header art; it is loaded once, so this runs once."""
+    return _header_bounds(header_art.splitlines())
 
 
 def _load_header_art() -> str:
@@ -143,132 +246,136 @@ def _load_header_art() -> str:
     return HEADER_ART
 
 
-def _set_voltages(options: ExperimentOptions, prompt):
+def _load_header_lines() -> list[str]:
+    """Header art split into lines, computed once alongside HEADER_ART."""
+    global HEADER_ART_LINES
+    if HEADER_ART_LINES is None:
+        HEADER_ART_LINES = _load_header_art().splitlines()
+    return HEADER_ART_LINES
+
+
+# Keys every dashboard run_config is expected to carry, with their defaults.
+_RUN_CONFIG_DEFAULTS = {
+    "run_label": "",
+    "output_dir": "",
+    "status_server_url": "",
+    "status_password": "",
+    "enable_live_plot": True,
+    "enable_server_plots": True,
+}
+
+
+# Dashboard row: kind is "section", "field" (getter/setter) or "action".
+_Entry = namedtuple("_Entry", "kind label getter setter action", defaults=(None, None, None))
+
+
+def _read_field(target, name: str):
+    """Read an attribute, or a key when the target is a dict (run_config)."""
+    return target[name] if isinstance(target, dict) else getattr(target, name)
+
+
+def _write_field(target, name: str, value) -> None:
+    if isinstance(target, dict):
+        target[name] = value
+    else:
+        setattr(target, name, value)
+
+
+def _set_voltages(options: ExperimentOptions, prompt) -> str | None:
+    """Prompt for the voltage list; returns an error message if input is invalid."""
     raw = prompt("Voltages (comma/space separated)", str, ",".join(str(v) for v in options.voltages))
     try:
         options.voltages = parse_voltage_list(raw)
     except ValueError as exc:
-        print(COL.wrap(f"Invalid voltage list: {exc}", COL.yellow))
-        time.sleep(0.7)
+        return f"Invalid voltage list: {exc}"
+    return None
 
 
 def _format_optional_list(values: Sequence[float] | None) -> str:
     if not values:
         return "(use default)"
-    return ", ".join(f"{v:g}" for v in values)
+    return ", ".join(["%g" % v for v in values])
 
 
 def _format_schedule_table(options: ExperimentOptions) -> list[str]:
     try:
-        schedule = build_voltage_schedule(
-            options.voltages,
-            options.repetitions,
-            options.alternate_with_zero,
-            options.voltage_time_min,
-            options.voltage_times_min,
-            options.zero_time_leading_min,
-            options.zero_times_min,
-        )
+        schedule, _ = _schedule(options)
     except ValueError as exc:
         return [f"(invalid schedule: {exc})"]
     if not schedule:
         return ["(none)"]
-
-    rows = []
-    for idx, step in enumerate(schedule, start=1):
-        rows.append([str(idx), f"{step['voltage']:g}", f"{step['time_min']:g}"])
-
-    headers = ["Step", "Voltage (V)", "Time (min)"]
-    widths = [len(h) for h in headers]
-    for row in rows:
-        for i, cell in enumerate(row):
-            widths[i] = max(widths[i], len(cell))
-
-    def line(sep: str = "-") -> str:
-        return "+" + "+".join(sep * (w + 2) for w in widths) + "+"
-
-    out = [line()]
-    out.append("|" + "|".join(f" {headers[i].ljust(widths[i])} " for i in range(len(headers))) + "|")
-    out.append(line())
-    for row in rows:
-        out.append("|" + "|".join(f" {row[i].rjust(widths[i])} " for i in range(len(row))) + "|")
-    out.append(line())
+    return _schedule_table_lines(schedule)
+
+
+def _schedule_table_lines(schedule: Sequence[dict]) -> list[str]:
+    """Boxed Step / Voltage / Time table for a non-empty schedule."""
+    rows = [(str(idx), f"{step['voltage']:g}", f"{step['time_min']:g}") for idx, step in enumerate(schedule, start=1)]
+    headers = ("Step", "Voltage (V)", "Time (min)")
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(headers)]
+    border = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+    # One format string per table kind: headers left-aligned, cells right-aligned.
+    header_fmt = "|" + "|".join(f" {{:<{w}}} " for w in widths) + "|"
+    row_fmt = "|" + "|".join(f" {{:>{w}}} " for w in widths) + "|"
+
+    out = [border, header_fmt.format(*headers), border]
+    out.extend([row_fmt.format(*row) for row in rows])
+    out.append(border)
     return out
 
 
-def _prompt_optional_float(label: str, current: float | None) -> float | None:
+def _set_optional_float(target, name: str, label: str) -> str | None:
+    """Prompt for an optional float attribute; returns an error message if input is invalid."""
+    current = getattr(target, name)
     current_label = "" if current is None else f"{current:g}"
     raw = input(f"{label} [{current_label or 'default'}]: ").strip()
     if raw == "":
-        return current
+        return None
     if raw.lower() in ("default", "none", "clear"):
+        setattr(target, name, None)
         return None
     try:
-        return float(raw)
+        setattr(target, name, float(raw))
     except Exception:
-        print(COL.wrap("Invalid input, keeping current.", COL.yellow))
-        time.sleep(0.7)
-        return current
+        return "Invalid input, keeping current."
+    return None
 
 
-def _prompt_optional_list(label: str, current: Sequence[float] | None) -> list[float] | None:
+def _set_optional_list(target, name: str, label: str) -> str | None:
+    """Prompt for an optional float-list attribute; returns an error message if input is invalid."""
+    current = getattr(target, name)
     current_label = "" if not current else ",".join(f"{v:g}" for v in current)
     raw = input(f"{label} [{current_label or 'default'}]: ").strip()
     if raw == "":
-        return list(current) if current else None
+        setattr(target, name, list(current) if current else None)
+        return None
     if raw.lower() in ("default", "none", "clear"):
+        setattr(target, name, None)
         return None
     try:
-        return parse_float_list(raw)
+        setattr(target, name, parse_float_list(raw))
     except ValueError as exc:
-        print(COL.wrap(f"Invalid list: {exc}", COL.yellow))
-        time.sleep(0.7)
-        return list(current) if current else None
+        setattr(target, name, list(current) if current else None)
+        return f"Invalid list: {exc}"
+    return None
 
 
-def _render_schedule_table(options: ExperimentOptions) -> None:
+def _render_schedule_table(options: ExperimentOptions, clear: bool = False) -> None:
+    """Show the schedule table (optionally clearing the screen first) in a single write."""
     try:
-        schedule = build_voltage_schedule(
-            options.voltages,
-            options.repetitions,
-            options.alternate_with_zero,
-            options.voltage_time_min,
-            options.voltage_times_min,
-            options.zero_time_leading_min,
-            options.zero_times_min,
-        )
+        schedule, _ = _schedule(options)
     except ValueError as exc:
-        print(COL.wrap(f"Cannot build schedule: {exc}", COL.red))
-        input("Press Enter to return...")
-        return
-
-    if not schedule:
-        print(COL.wrap("No schedule steps to display.", COL.yellow))
-        input("Press Enter to return...")
-        return
+        out = [wrap(f"Cannot build schedule: {exc}", RED)]
+    else:
+        if schedule:
+            out = _schedule_table_lines(schedule)
+            total_min = sum(step["time_min"] for step in schedule)
+            out.append(f"Total: {total_min:g} min, {len(schedule)} steps")
+        else:
+            out = [wrap("No schedule steps to display.", YELLOW)]
 
-    rows = []
-    for idx, step in enumerate(schedule, start=1):
-        rows.append([str(idx), f"{step['voltage']:g}", f"{step['time_min']:g}"])
-
-    headers = ["Step", "Voltage (V)", "Time (min)"]
-    widths = [len(h) for h in headers]
-    for row in rows:
-        for i, cell in enumerate(row):
-            widths[i] = max(widths[i], len(cell))
-
-    def line(sep: str = "-") -> str:
-        return "+" + "+".join(sep * (w + 2) for w in widths) + "+"
-
-    print(line())
-    header_line = "|" + "|".join(f" {headers[i].ljust(widths[i])} " for i in range(len(headers))) + "|"
-    print(header_line)
-    print(line())
-    for row in rows:
-        print("|" + "|".join(f" {row[i].rjust(widths[i])} " for i in range(len(row))) + "|")
-    print(line())
-    total_min = sum(step["time_min"] for step in schedule)
-    print(f"Total: {total_min:g} min, {len(schedule)} steps")
+    # Clear, table (it can be hundreds of rows) and total in one write.
+    sys.stdout.write(("\033[2J\033[H" if clear else "") + "\n".join(out) + "\n")
+    sys.stdout.flush()
     input("Press Enter to return...")
 
 
@@ -289,32 +396,166 @@ def _set_current_range_uA(settings: InstrumentSettings, prompt) -> None:
     settings.current_range_a = float(new_val) * 1e-6
 
 
-def _set_gate_current_range(settings: GateSourceSettings, prompt) -> None:
-    """Prompt gate current range; blank or 0 disables explicit setting."""
+def _set_gate_current_range(settings: GateSourceSettings, prompt) -> str | None:
+    """
+    Prompt gate current range; blank or 0 disables explicit setting.
+    Returns an error message if input is invalid.
+    """
     current_a = settings.current_range_a if settings.current_range_a is not None else ""
     raw = prompt("Gate current range (A, 0/blank to skip)", str, current_a)
     if raw in ("", None):
         settings.current_range_a = None
-        return
+        return None
     try:
         value = float(raw)
     except Exception:
-        print(COL.wrap("Invalid current range, keeping current.", COL.yellow))
-        time.sleep(0.7)
-        return
+        return "Invalid current range, keeping current."
     settings.current_range_a = None if value == 0 else value
+    return None
 
 
-def clear_screen() -> None:
-    """Clear terminal output and move cursor to top-left."""
-    sys.stdout.write("\033[2J\033[H")
-    sys.stdout.flush()
+# DEC mode 2026 (synchronized output): supporting terminals show the frame
+# only once it is complete, so a repaint never tears. Others ignore it.
+_SYNC_BEGIN, _SYNC_END = ("\x1b[?2026h", "\x1b[?2026l") if COLORS_ENABLED else ("", "")
 
 
-def read_key() -> str:
-    """Read a single key (handles arrow keys); falls back to input when not a TTY."""
+def _frame_update(prev_lines: list[str] | None, lines: list[str], size: os.terminal_size | None) -> str:
+    """
+    Return the output needed to turn the previously painted frame into `lines`.
+    Only rows that changed are rewritten, at the screen row a full paint left
+    them on; a full clear + repaint is used when there is no previous frame,
+    the terminal size changed (size is None), the line count changed, or a
+    changed line wraps onto a different number of rows. An unchanged frame at
+    an unchanged size needs no output.
+    """
+    if size is not None and lines == prev_lines:
+        return ""
+    full = "\033[2J\033[H" + "\n".join(lines) + "\n"
+    if prev_lines is None or size is None or len(lines) != len(prev_lines):
+        return full
+    # Screen rows each line takes (wide header art wraps on narrow terminals).
+    # A full paint ends with a newline, so once it needs more rows than the
+    # screen has, its first `offset` rows have scrolled off the top.
+    heights = [max(1, -(-_visible_len(line) // size.columns)) for line in lines]
+    painted = sum(heights)
+    offset = max(0, painted + 1 - size.lines)
+    out = []
+    top = 0
+    for line, prev, height in zip(lines, prev_lines, heights):
+        if line != prev:
+            if height != max(1, -(-_visible_len(prev) // size.columns)):
+                return full
+            if top >= offset:
+                # Erase every row the line wraps onto, then rewrite it from its first row.
+                row = top - offset + 1
+                out.append("".join([f"\033[{row + k};1H\033[2K" for k in range(height)]))
+                out.append(f"\033[{row};1H{line}")
+        top += height
+    # Leave the cursor below the frame, where a full repaint would put it.
+    out.append(f"\033[{painted - offset + 1};1H")
+    return "".join(out)
+
+
+# Raw input bytes read past the last returned key (e.g. fast typing).
+_PENDING_KEYS = b""
+
+
+def _incomplete_escape(data: bytes) -> bool:
+    """True for a lone ESC or a CSI prefix still waiting for its final byte."""
+    return data in (b"\x1b", b"\x1b[")
+
+
+def _split_key(data: bytes) -> tuple[str, bytes]:
+    """Split one key off raw terminal input; returns (key, remaining bytes)."""
+    if data[:2] == b"\x1b[" and len(data) >= 3:
+        return f"ESC[{chr(data[2])}", data[3:]
+    return data[:1].decode(errors="ignore"), data[1:]
+
+
+# Raw-mode state set by raw_mode(): (fd, cooked attrs, raw attrs), or None.
+_RAW_STATE: tuple[int, list, list] | None = None
+
+
+@contextmanager
+def raw_mode(fd: int):
+    """
+    Keep the terminal on `fd` in raw mode for the whole block so read_key does
+    not reconfigure it on every keystroke. Output post-processing stays on so
+    "\\n" still returns to column 0. No-op off a TTY or when already active.
+    """
+    global _RAW_STATE
+    if msvcrt or _RAW_STATE is not None or not os.isatty(fd):
+        yield
+        return
+    import termios
+    import tty
+
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setraw(fd)
+        raw_settings = termios.tcgetattr(fd)
+        raw_settings[1] |= termios.OPOST  # oflag
+        termios.tcsetattr(fd, termios.TCSANOW, raw_settings)
+        _RAW_STATE = (fd, old_settings, raw_settings)
+        yield
+    finally:
+        _RAW_STATE = None
+        # Output processing is the same in both modes, so there is no need to
+        # wait for pending output to drain (TCSADRAIN) before switching.
+        termios.tcsetattr(fd, termios.TCSANOW, old_settings)
+
+
+@contextmanager
+def cooked_mode():
+    """Temporarily leave raw_mode() (e.g. around input() prompts)."""
+    state = _RAW_STATE
+    if state is None:
+        yield
+        return
+    import termios
+
+    fd, old_settings, raw_settings = state
+    termios.tcsetattr(fd, termios.TCSANOW, old_settings)
+    try:
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSANOW, raw_settings)
+
+
+def _read_raw_key(fd: int, timeout: float | None) -> str | None:
+    """Read one key from a terminal that is already in raw mode."""
+    global _PENDING_KEYS
+    # Start from a leftover escape prefix, if read_key handed one over.
+    data, _PENDING_KEYS = _PENDING_KEYS, b""
+    if not data:
+        if timeout is not None:
+            ready, _, _ = select.select([fd], [], [], timeout)
+            if not ready:
+                return None
+        # One read of the fd gets a whole escape sequence; bytes left in
+        # sys.stdin's buffer would also be invisible to select().
+        data = os.read(fd, 8)
+    while _incomplete_escape(data) and select.select([fd], [], [], 0.05)[0]:
+        # ESC or ESC[ alone: give a split arrow-key sequence a moment to arrive.
+        data += os.read(fd, 8)
+    key, _PENDING_KEYS = _split_key(data)
+    return key
+
+
+def read_key(timeout: float | None = None) -> str | None:
+    """
+    Read a single key (handles arrow keys); falls back to input when not a TTY.
+    With a timeout (seconds), returns None if no key arrives in time.
+    """
+    global _PENDING_KEYS
     # Windows: use msvcrt for key reads to support arrows without blocking stdin.
     if msvcrt:
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            while not msvcrt.kbhit():
+                if time.monotonic() >= deadline:
+                    return None
+                time.sleep(0.02)
         first = msvcrt.getch()
         if first in (b"\x00", b"\xe0"):
             second = msvcrt.getch()
@@ -326,26 +567,29 @@ def read_key() -> str:
         except Exception:
             return ""
 
-    if not sys.stdin.isatty() or termios is None or tty is None:
+    if not sys.stdin.isatty():
         return input()
+    if _PENDING_KEYS and not _incomplete_escape(_PENDING_KEYS):
+        key, _PENDING_KEYS = _split_key(_PENDING_KEYS)
+        return key
     fd = sys.stdin.fileno()
+    if _RAW_STATE is not None and _RAW_STATE[0] == fd:
+        return _read_raw_key(fd, timeout)
+    # Outside raw_mode(): switch the terminal for this one key. POSIX-only
+    # modules are imported here so `import ui` stays cheap and Windows-safe.
+    import termios
+    import tty
+
     old_settings = termios.tcgetattr(fd)
     try:
         tty.setraw(fd)
-        ch1 = sys.stdin.read(1)
-        if ch1 == "\x1b":
-            ch2 = sys.stdin.read(1)
-            if ch2 == "[":
-                ch3 = sys.stdin.read(1)
-                return f"ESC[{ch3}"
-            return ch1
-        return ch1
+        return _read_raw_key(fd, timeout)
     finally:
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
 
 def print_order(order: Sequence[float]) -> None:
-    formatted = ", ".join(f"{v:g}V" for v in order)
+    formatted = ", ".join(["%gV" % v for v in order])
     print(f"Measurement order ({len(order)} steps): {formatted}")
 
 
@@ -360,28 +604,29 @@ def print_run_options(
     status_password_set: bool = False,
 ) -> None:
     """Print current measurement options so the user sees them even on errors."""
-    header = COL.wrap("=== Current measurement setup ===", COL.blue + COL.bold)
-    print(header)
-    print(f"Run label:          {run_label}")
-    print(f"Output directory:   {output_dir}")
-    print(f"Device ID:           {COL.wrap(settings.device_id, COL.green)}")
-    print(f"Voltages (input):    {COL.wrap(str(options.voltages), COL.green)}")
-    print("Schedule:")
+    lines = [
+        _RUN_OPTIONS_HEADER,
+        f"Run label:          {run_label}",
+        f"Output directory:   {output_dir}",
+        f"Device ID:           {wrap(settings.device_id, GREEN)}",
+        f"Voltages (input):    {wrap(str(options.voltages), GREEN)}",
+        "Schedule:",
+    ]
     for line in _format_schedule_table(options):
-        print(f"  {COL.wrap(line, COL.green)}")
-    print(f"Voltage order:       {COL.wrap(', '.join(f'{v:g}' for v in order), COL.green)}")
-    print(f"Default step time:   {options.voltage_time_min} min per step")
-    print(f"Per-voltage times:   {_format_optional_list(options.voltage_times_min)} min")
+        lines.append(f"  {wrap(line, GREEN)}")
+    lines.append(f"Voltage order:       {wrap(', '.join(['%g' % v for v in order]), GREEN)}")
+    lines.append(f"Default step time:   {options.voltage_time_min} min per step")
+    lines.append(f"Per-voltage times:   {_format_optional_list(options.voltage_times_min)} min")
     if options.alternate_with_zero:
         lead_zero = f"{options.zero_time_leading_min:g}" if options.zero_time_leading_min is not None else "(use default)"
-        print(f"Leading zero time:   {lead_zero} min")
-        print(f"Zero-after times:    {_format_optional_list(options.zero_times_min)} min")
-    print(f"Repetitions:         {options.repetitions}")
-    print(f"Alternate with zero: {options.alternate_with_zero}")
-    print(f"Single sweep mode:   {options.single_sweep}")
+        lines.append(f"Leading zero time:   {lead_zero} min")
+        lines.append(f"Zero-after times:    {_format_optional_list(options.zero_times_min)} min")
+    lines.append(f"Repetitions:         {options.repetitions}")
+    lines.append(f"Alternate with zero: {options.alternate_with_zero}")
+    lines.append(f"Single sweep mode:   {options.single_sweep}")
     scan_label = "forward" if settings.scan_direction == 0 else "reverse" if settings.scan_direction == 3 else f"custom({settings.scan_direction})"
     current_uA = settings.current_range_a * 1e6
-    print(
+    lines.append(
         f"Zurich: host={settings.server_host} port={settings.server_port} "
         f"freq {settings.freq_start_hz:g}->{settings.freq_stop_hz:g} "
         f"points per sweep={settings.points_per_sweep} "
@@ -390,7 +635,7 @@ def print_run_options(
     )
     gate_label = gate_settings.visa_resource or "(select at run)"
     gate_current = gate_settings.current_range_a if gate_settings.current_range_a is not None else "auto"
-    print(
+    lines.append(
         f"Gate source: visa={gate_label} "
         f"terminals={'rear' if gate_settings.use_rear_terminals else 'front'} "
         f"NPLC={gate_settings.nplc} current_range={gate_current} "
@@ -399,8 +644,175 @@ def print_run_options(
     status_label = status_server_url or "(disabled)"
     if status_password_set:
         status_label = f"{status_label} (auth set)"
-    print(f"Status push:        {status_label}")
-    print(COL.wrap("===============================", COL.blue))
+    lines.append(f"Status push:        {status_label}")
+    lines.append(_RUN_OPTIONS_FOOTER)
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+@dataclass
+class _DashboardContext:
+    """State the dashboard entry getters/setters read and edit."""
+
+    options: ExperimentOptions
+    settings: InstrumentSettings
+    gate_settings: GateSourceSettings
+    run_config: dict
+    prompt: Callable
+    prompt_bool: Callable
+
+
+def _edit_field(ctx: _DashboardContext, target: str, name: str, text: str, cast) -> None:
+    """Prompt for a plain field of ctx.<target> and store it; cast=bool uses a y/n prompt."""
+    obj = getattr(ctx, target)
+    current = _read_field(obj, name)
+    value = ctx.prompt_bool(text, current) if cast is bool else ctx.prompt(text, cast, current)
+    _write_field(obj, name, value)
+
+
+def _field(label: str, target: str, name: str, cast, text: str | None = None, display=None) -> _Entry:
+    """Entry editing field `name` of the context object named `target`."""
+    return _Entry(
+        "field",
+        label,
+        getter=display or (lambda ctx: _read_field(getattr(ctx, target), name)),
+        setter=partial(_edit_field, target=target, name=name, text=text or label, cast=cast),
+    )
+
+
+# Dashboard layout, built once per process; getters/setters take a _DashboardContext.
+_DASHBOARD_ENTRIES = (
+    _Entry("section", "Measurement Settings"),
+    _Entry(
+        "field",
+        "Voltages",
+        getter=lambda ctx: ctx.options.voltages,
+        setter=lambda ctx: _set_voltages(ctx.options, ctx.prompt),
+    ),
+    _field("Default step time (min)", "options", "voltage_time_min", float, "Default time per step (min)"),
+    _Entry(
+        "field",
+        "Per-voltage times (min list)",
+        getter=lambda ctx: _format_optional_list(ctx.options.voltage_times_min),
+        setter=lambda ctx: _set_optional_list(
+            ctx.options, "voltage_times_min", "Per-voltage times (min, list or 'default')"
+        ),
+    ),
+    _Entry(
+        "field",
+        "Leading zero time (min)",
+        getter=lambda ctx: ctx.options.zero_time_leading_min if ctx.options.zero_time_leading_min is not None else "(use default)",
+        setter=lambda ctx: _set_optional_float(
+            ctx.options, "zero_time_leading_min", "Leading zero time (min or 'default')"
+        ),
+    ),
+    _Entry(
+        "field",
+        "Zero-after times (min list)",
+        getter=lambda ctx: _format_optional_list(ctx.options.zero_times_min),
+        setter=lambda ctx: _set_optional_list(
+            ctx.options, "zero_times_min", "Zero-after times (min, list or 'default')"
+        ),
+    ),
+    _field("Repetitions", "options", "repetitions", int),
+    _field("Alternate with zero", "options", "alternate_with_zero", bool, "Alternate with zero? (y/n)"),
+    _Entry("section", "Run Settings"),
+    _field("Run label", "run_config", "run_label", str),
+    _field("Output directory", "run_config", "output_dir", str),
+    _field(
+        "Status server URL",
+        "run_config",
+        "status_server_url",
+        str,
+        "Status server URL (blank to disable)",
+        display=lambda ctx: ctx.run_config["status_server_url"] or "(disabled)",
+    ),
+    _field(
+        "Status password",
+        "run_config",
+        "status_password",
+        str,
+        display=lambda ctx: "***" if ctx.run_config["status_password"] else "(not set)",
+    ),
+    _field("Enable live plot", "run_config", "enable_live_plot", bool, "Enable live plot? (y/n)"),
+    _field("Enable server plots", "run_config", "enable_server_plots", bool, "Enable server plots? (y/n)"),
+    _Entry("section", "Zurich Instrument Settings"),
+    _field("DEVICE_ID", "settings", "device_id", str),
+    _field("Server host", "settings", "server_host", str),
+    _field("Server port", "settings", "server_port", int),
+    _field("API level", "settings", "api_level", int),
+    _field("Frequency start (Hz)", "settings", "freq_start_hz", float),
+    _field("Frequency stop (Hz)", "settings", "freq_stop_hz", float),
+    _field("Points per sweep", "settings", "points_per_sweep", int),
+    _Entry(
+        "field",
+        "Scan direction (forward/reverse)",
+        getter=lambda ctx: "forward" if ctx.settings.scan_direction == 0 else "reverse" if ctx.settings.scan_direction == 3 else f"custom({ctx.settings.scan_direction})",
+        setter=lambda ctx: _toggle_scan_direction(ctx.settings, ctx.prompt_bool),
+    ),
+    _Entry(
+        "field",
+        "Current range (uA)",
+        getter=lambda ctx: ctx.settings.current_range_a * 1e6,
+        setter=lambda ctx: _set_current_range_uA(ctx.settings, ctx.prompt),
+    ),
+    _Entry("section", "Gate Source (Keithley 2450)"),
+    _Entry(
+        "field",
+        "VISA resource",
+        getter=lambda ctx: ctx.gate_settings.visa_resource or "(select at run)",
+        setter=lambda ctx: setattr(
+            ctx.gate_settings,
+            "visa_resource",
+            (ctx.prompt("VISA resource (blank to choose at run)", str, ctx.gate_settings.visa_resource or "") or None),
+        ),
+    ),
+    _field("Use rear terminals", "gate_settings", "use_rear_terminals", bool, "Use rear terminals? (n selects front)"),
+    _field("NPLC", "gate_settings", "nplc", float),
+    _Entry(
+        "field",
+        "Current range (A)",
+        getter=lambda ctx: ctx.gate_settings.current_range_a if ctx.gate_settings.current_range_a is not None else "auto",
+        setter=lambda ctx: _set_gate_current_range(ctx.gate_settings, ctx.prompt),
+    ),
+    _field("Settle tolerance (V)", "gate_settings", "settle_tolerance_v", float),
+    _Entry("section", "Actions"),
+    _Entry("action", "Reset Zurich settings to defaults", action="reset"),
+    _Entry("action", "List VISA resources", action="list_visa"),
+    _Entry("action", "Preview live plot (fake data)", action="preview"),
+    _Entry("action", "Preview server plots (fake data)", action="preview_server"),
+    _Entry("action", "Show timing schedule table", action="schedule"),
+    _Entry("action", "Start measurement", action="start"),
+    _Entry("action", "Run single sweep test", action="single"),
+    _Entry("action", "Quit", action="quit"),
+)
+
+# Static styled text, built once instead of per frame.
+_HOTKEY_BANNER = _highlight_hotkeys(
+    [
+        "Settings (",
+        "↑/↓",
+        " or ",
+        "j/k",
+        " to navigate, ",
+        "Enter",
+        " to edit/run, ",
+        "q",
+        " to quit)",
+    ]
+)
+_SECTION_TITLES = {
+    i: wrap(f"[{entry.label}]", BLUE_BOLD) for i, entry in enumerate(_DASHBOARD_ENTRIES) if entry.kind == "section"
+}
+# Field label parts as item_line lays them out: (label part, visible length).
+_FIELD_LABELS: dict[int, tuple[str, int]] = {
+    i: (f"{entry.label}:", len(entry.label) + 1) for i, entry in enumerate(_DASHBOARD_ENTRIES) if entry.kind == "field"
+}
+# The selected row is green from its ▶ marker through its ◀ marker.
+_SEL_LEFT = f"{GREEN}▶"
+_SEL_RIGHT = f"◀{RESET}"
+# Indices of the entries the cursor can land on; sections are skipped.
+_SELECTABLE = [i for i, entry in enumerate(_DASHBOARD_ENTRIES) if entry.kind != "section"]
 
 
 def settings_dashboard(
@@ -416,374 +828,219 @@ def settings_dashboard(
     """
 
     def prompt(text: str, cast, current):
+        nonlocal status_msg
         raw = input(f"{text} [{current}]: ").strip()
         if raw == "":
             return current
         try:
             return cast(raw)
         except Exception:
-            print(COL.wrap("Invalid input, keeping current.", COL.yellow))
-            time.sleep(0.7)
+            status_msg = "Invalid input, keeping current."
             return current
 
     def prompt_bool(text: str, current: bool) -> bool:
         val = prompt(text, str, "y" if current else "n")
         return str(val).lower().startswith("y")
 
-    entries = [
-        {"kind": "section", "label": "Measurement Settings"},
-        {
-            "kind": "field",
-            "label": "Voltages",
-            "getter": lambda: options.voltages,
-            "setter": lambda: _set_voltages(options, prompt),
-        },
-        {
-            "kind": "field",
-            "label": "Default step time (min)",
-            "getter": lambda: options.voltage_time_min,
-            "setter": lambda: setattr(
-                options, "voltage_time_min", prompt("Default time per step (min)", float, options.voltage_time_min)
-            ),
-        },
-        {
-            "kind": "field",
-            "label": "Per-voltage times (min list)",
-            "getter": lambda: _format_optional_list(options.voltage_times_min),
-            "setter": lambda: setattr(
-                options,
-                "voltage_times_min",
-                _prompt_optional_list("Per-voltage times (min, list or 'default')", options.voltage_times_min),
-            ),
-        },
-        {
-            "kind": "field",
-            "label": "Leading zero time (min)",
-            "getter": lambda: options.zero_time_leading_min if options.zero_time_leading_min is not None else "(use default)",
-            "setter": lambda: setattr(
-                options,
-                "zero_time_leading_min",
-                _prompt_optional_float("Leading zero time (min or 'default')", options.zero_time_leading_min),
-            ),
-        },
-        {
-            "kind": "field",
-            "label": "Zero-after times (min list)",
-            "getter": lambda: _format_optional_list(options.zero_times_min),
-            "setter": lambda: setattr(
-                options,
-                "zero_times_min",
-                _prompt_optional_list("Zero-after times (min, list or 'default')", options.zero_times_min),
-            ),
-        },
-        {
-            "kind": "field",
-            "label": "Repetitions",
-            "getter": lambda: options.repetitions,
-            "setter": lambda: setattr(options, "repetitions", prompt("Repetitions", int, options.repetitions)),
-        },
-        {
-            "kind": "field",
-            "label": "Alternate with zero",
-            "getter": lambda: options.alternate_with_zero,
-            "setter": lambda: setattr(
-                options, "alternate_with_zero", prompt_bool("Alternate with zero? (y/n)", options.alternate_with_zero)
-            ),
-        },
-        {"kind": "section", "label": "Run Settings"},
-        {
-            "kind": "field",
-            "label": "Run label",
-            "getter": lambda: run_config.get("run_label", ""),
-            "setter": lambda: run_config.__setitem__("run_label", prompt("Run label", str, run_config.get("run_label", ""))),
-        },
-        {
-            "kind": "field",
-            "label": "Output directory",
-            "getter": lambda: run_config.get("output_dir", ""),
-            "setter": lambda: run_config.__setitem__("output_dir", prompt("Output directory", str, run_config.get("output_dir", ""))),
-        },
-        {
-            "kind": "field",
-            "label": "Status server URL",
-            "getter": lambda: run_config.get("status_server_url", "") or "(disabled)",
-            "setter": lambda: run_config.__setitem__(
-                "status_server_url", prompt("Status server URL (blank to disable)", str, run_config.get("status_server_url", ""))
-            ),
-        },
-        {
-            "kind": "field",
-            "label": "Status password",
-            "getter": lambda: "***" if run_config.get("status_password") else "(not set)",
-            "setter": lambda: run_config.__setitem__(
-                "status_password", prompt("Status password", str, run_config.get("status_password", ""))
-            ),
-        },
-        {
-            "kind": "field",
-            "label": "Enable live plot",
-            "getter": lambda: run_config.get("enable_live_plot", True),
-            "setter": lambda: run_config.__setitem__(
-                "enable_live_plot", prompt_bool("Enable live plot? (y/n)", run_config.get("enable_live_plot", True))
-            ),
-        },
-        {
-            "kind": "field",
-            "label": "Enable server plots",
-            "getter": lambda: run_config.get("enable_server_plots", True),
-            "setter": lambda: run_config.__setitem__(
-                "enable_server_plots", prompt_bool("Enable server plots? (y/n)", run_config.get("enable_server_plots", True))
-            ),
-        },
-        {"kind": "section", "label": "Zurich Instrument Settings"},
-        {
-            "kind": "field",
-            "label": "DEVICE_ID",
-            "getter": lambda: settings.device_id,
-            "setter": lambda: setattr(settings, "device_id", prompt("DEVICE_ID", str, settings.device_id)),
-        },
-        {
-            "kind": "field",
-            "label": "Server host",
-            "getter": lambda: settings.server_host,
-            "setter": lambda: setattr(settings, "server_host", prompt("Server host", str, settings.server_host)),
-        },
-        {
-            "kind": "field",
-            "label": "Server port",
-            "getter": lambda: settings.server_port,
-            "setter": lambda: setattr(settings, "server_port", prompt("Server port", int, settings.server_port)),
-        },
-        {
-            "kind": "field",
-            "label": "API level",
-            "getter": lambda: settings.api_level,
-            "setter": lambda: setattr(settings, "api_level", prompt("API level", int, settings.api_level)),
-        },
-        {
-            "kind": "field",
-            "label": "Frequency start (Hz)",
-            "getter": lambda: settings.freq_start_hz,
-            "setter": lambda: setattr(settings, "freq_start_hz", prompt("Frequency start (Hz)", float, settings.freq_start_hz)),
-        },
-        {
-            "kind": "field",
-            "label": "Frequency stop (Hz)",
-            "getter": lambda: settings.freq_stop_hz,
-            "setter": lambda: setattr(settings, "freq_stop_hz", prompt("Frequency stop (Hz)", float, settings.freq_stop_hz)),
-        },
-        {
-            "kind": "field",
-            "label": "Points per sweep",
-            "getter": lambda: settings.points_per_sweep,
-            "setter": lambda: setattr(settings, "points_per_sweep", prompt("Points per sweep", int, settings.points_per_sweep)),
-        },
-        {
-            "kind": "field",
-            "label": "Scan direction (forward/reverse)",
-            "getter": lambda: "forward" if settings.scan_direction == 0 else "reverse" if settings.scan_direction == 3 else f"custom({settings.scan_direction})",
-            "setter": lambda: _toggle_scan_direction(settings, prompt_bool),
-        },
-        {
-            "kind": "field",
-            "label": "Current range (uA)",
-            "getter": lambda: settings.current_range_a * 1e6,
-            "setter": lambda: _set_current_range_uA(settings, prompt),
-        },
-        {"kind": "section", "label": "Gate Source (Keithley 2450)"},
-        {
-            "kind": "field",
-            "label": "VISA resource",
-            "getter": lambda: gate_settings.visa_resource or "(select at run)",
-            "setter": lambda: setattr(
-                gate_settings,
-                "visa_resource",
-                (prompt("VISA resource (blank to choose at run)", str, gate_settings.visa_resource or "") or None),
-            ),
-        },
-        {
-            "kind": "field",
-            "label": "Use rear terminals",
-            "getter": lambda: gate_settings.use_rear_terminals,
-            "setter": lambda: setattr(
-                gate_settings,
-                "use_rear_terminals",
-                prompt_bool("Use rear terminals? (n selects front)", gate_settings.use_rear_terminals),
-            ),
-        },
-        {
-            "kind": "field",
-            "label": "NPLC",
-            "getter": lambda: gate_settings.nplc,
-            "setter": lambda: setattr(gate_settings, "nplc", prompt("NPLC", float, gate_settings.nplc)),
-        },
-        {
-            "kind": "field",
-            "label": "Current range (A)",
-            "getter": lambda: gate_settings.current_range_a if gate_settings.current_range_a is not None else "auto",
-            "setter": lambda: _set_gate_current_range(gate_settings, prompt),
-        },
-        {
-            "kind": "field",
-            "label": "Settle tolerance (V)",
-            "getter": lambda: gate_settings.settle_tolerance_v,
-            "setter": lambda: setattr(
-                gate_settings, "settle_tolerance_v", prompt("Settle tolerance (V)", float, gate_settings.settle_tolerance_v)
-            ),
-        },
-        {"kind": "section", "label": "Actions"},
-        {"kind": "action", "label": "Reset Zurich settings to defaults", "action": "reset"},
-        {"kind": "action", "label": "List VISA resources", "action": "list_visa"},
-        {"kind": "action", "label": "Preview live plot (fake data)", "action": "preview"},
-        {"kind": "action", "label": "Preview server plots (fake data)", "action": "preview_server"},
-        {"kind": "action", "label": "Show timing schedule table", "action": "schedule"},
-        {"kind": "action", "label": "Start measurement", "action": "start"},
-        {"kind": "action", "label": "Run single sweep test", "action": "single"},
-        {"kind": "action", "label": "Quit", "action": "quit"},
-    ]
-
-    def next_selectable(idx: int, delta: int) -> int:
-        new_idx = idx
-        while True:
-            new_idx = (new_idx + delta) % len(entries)
-            if entries[new_idx]["kind"] != "section":
-                return new_idx
-
-    idx = next_selectable(0, 1)
-    while True:
-        clear_screen()
-        header_art = _load_header_art()
-        header_lines = header_art.splitlines()
-        left_idx, right_idx = _header_bounds(header_lines)
-        header_width = right_idx - left_idx + 1 if right_idx >= left_idx else 0
-        base_indent = max(0, left_idx if right_idx >= left_idx else 0)
-        content_width = max(0, header_width - 2 * SIDE_PAD) if header_width > 0 else 0
-        est_steps, est_seconds = _estimate_steps_and_time(options)
-        debug_enabled = os.environ.get("DEBUG", "").strip() not in ("", "0", "false", "False")
-
-        def render_header_meta() -> None:
-            if header_width <= 0:
-                return
-            left = UI_VERSION
-            right = UI_VERSION_DATE
-            inner_space = max(1, header_width - len(left) - len(right))
-            pad = " " * base_indent
-            print(f"{pad}{left}{' ' * inner_space}{right}")
-
-        def render_line(text: str = "") -> None:
-            plain_len = _visible_len(text)
-            if header_width > 0:
-                pad = " " * base_indent + " " * SIDE_PAD + " " * max(0, (content_width - plain_len) // 2)
-                print(pad + text)
-            else:
-                print(text)
-
-        def render_full_bar() -> None:
-            if header_width > 0:
-                print(" " * base_indent + "=" * header_width)
-            else:
-                print("=" * 65)
-
-        def render_item(text: str, selected: bool, show_right_marker: bool = True) -> None:
-            left_marker = "▶" if selected else ""
-            right_marker = "◀" if selected and show_right_marker else ""
-            left_pad = " " * base_indent + " " * SIDE_PAD  # inset to center block visually
-            if header_width > 0:
-                marker_space = (1 if selected else 0) + (1 if selected and show_right_marker else 0)
-                width_for_content = max(0, content_width - marker_space)
-                if ":" in text:
-                    label, val = text.split(":", 1)
-                    label_part = f"{label.strip()}:"
-                    val_part = val.strip()
-                    label_len = _visible_len(label_part)
-                    val_len = _visible_len(val_part)
-                    space_len = width_for_content - label_len - val_len
-                    if space_len < 1:
-                        # If too tight, truncate value.
-                        max_val_len = max(0, width_for_content - label_len - 1)
-                        if max_val_len > 3 and val_len > max_val_len:
-                            val_part = val_part[: max_val_len - 3] + "..."
-                            val_len = _visible_len(val_part)
-                        space_len = max(1, width_for_content - label_len - val_len)
-                    content = f"{label_part}{' ' * space_len}{val_part}"
-                else:
-                    content = text
-                    visible_len = _visible_len(content)
-                    if visible_len > width_for_content and width_for_content > 3:
-                        content = content[: width_for_content - 3] + "..."
-                spaces = max(0, width_for_content - _visible_len(content))
-                if selected:
-                    print(f"{left_pad}{left_marker}{content}{' ' * spaces}{right_marker}")
-                else:
-                    print(f"{left_pad}{content}")
+    for key, default in _RUN_CONFIG_DEFAULTS.items():
+        run_config.setdefault(key, default)
+    ctx = _DashboardContext(options, settings, gate_settings, run_config, prompt, prompt_bool)
+    entries = _DASHBOARD_ENTRIES
+
+    pos = 0
+    idx = _SELECTABLE[pos]
+    # Last painted frame; None forces a full repaint (first frame, after prompts).
+    prev_lines: list[str] | None = None
+    prev_size = None
+    # Rendered entry rows keyed by index: (value, selected, line).
+    render_cache: dict[int, tuple] = {}
+    # Read once; changing DEBUG while the dashboard is open is not supported.
+    debug_enabled = os.environ.get("DEBUG", "").strip() not in ("", "0", "false", "False")
+    # (steps, seconds) estimate; None marks it stale after a field edit.
+    estimate: tuple[int, float] | None = None
+    # Layout follows the header art, which is loaded once: fixed for every frame.
+    header_art = _load_header_art()
+    header_lines = _load_header_lines()
+    left_idx, right_idx = _header_art_bounds(header_art)
+    header_width = right_idx - left_idx + 1 if right_idx >= left_idx else 0
+    base_indent = max(0, left_idx if right_idx >= left_idx else 0)
+    content_width = max(0, header_width - 2 * SIDE_PAD) if header_width > 0 else 0
+    base_pad = " " * base_indent
+    left_pad = base_pad + " " * SIDE_PAD  # inset to center block visually
+    full_bar = base_pad + "=" * header_width if header_width > 0 else "=" * 65
+    # Frame lines (without newlines); written in one call after diffing.
+    lines: list[str] = []
+    # Frame row of each entry, and the entry the selection just moved away from
+    # (set only when nothing but the selection changed since the last frame).
+    entry_rows: dict[int, int] = {}
+    moved_from: int | None = None
+
+    def render_header_meta() -> None:
+        if header_width <= 0:
+            return
+        left = UI_VERSION
+        right = UI_VERSION_DATE
+        inner_space = max(1, header_width - len(left) - len(right))
+        lines.append(f"{base_pad}{left}{' ' * inner_space}{right}")
+
+    def render_line(text: str = "") -> None:
+        plain_len = _visible_len(text)
+        if header_width > 0:
+            lines.append(f"{left_pad}{' ' * max(0, (content_width - plain_len) // 2)}{text}")
+        else:
+            lines.append(text)
+
+    def render_full_bar() -> None:
+        lines.append(full_bar)
+
+    def item_line(
+        text: str, selected: bool, show_right_marker: bool = True, label: tuple[str, int] | None = None
+    ) -> str:
+        if header_width > 0:
+            marker_space = (1 if selected else 0) + (1 if selected and show_right_marker else 0)
+            width_for_content = max(0, content_width - marker_space)
+            val_part = None
+            if label is not None:
+                # Precomputed (label part, visible length); text starts with it.
+                label_part, label_len = label
+                val_part = text[len(label_part) :].strip()
+            elif ":" in text:
+                label_text, val = text.split(":", 1)
+                label_part = f"{label_text.strip()}:"
+                val_part = val.strip()
+                label_len = _visible_len(label_part)
+            if val_part is not None:
+                val_len = _visible_len(val_part)
+                space_len = width_for_content - label_len - val_len
+                if space_len < 1:
+                    # If too tight, truncate value.
+                    max_val_len = max(0, width_for_content - label_len - 1)
+                    if max_val_len > 3 and val_len > max_val_len:
+                        val_part = val_part[: max_val_len - 3] + "..."
+                        val_len = _visible_len(val_part)
+                    space_len = max(1, width_for_content - label_len - val_len)
+                content = f"{label_part}{' ' * space_len}{val_part}"
             else:
-                suffix = f" {right_marker}" if selected and show_right_marker else ""
-                prefix = f"{left_marker}" if selected else ""
-                print(f"{prefix}{text}{suffix}")
+                content = text
+                visible_len = _visible_len(content)
+                if visible_len > width_for_content and width_for_content > 3:
+                    content = content[: width_for_content - 3] + "..."
+            spaces = max(0, width_for_content - _visible_len(content))
+            if selected:
+                right_marker = _SEL_RIGHT if show_right_marker else RESET
+                return f"{left_pad}{_SEL_LEFT}{content}{' ' * spaces}{right_marker}"
+            return f"{left_pad}{content}"
+        if selected:
+            suffix = f" {_SEL_RIGHT}" if show_right_marker else RESET
+            return f"{_SEL_LEFT}{text}{suffix}"
+        return text
+
+    def entry_line(i: int) -> str:
+        """Row for entry i, reusing the cached line while value and selection are unchanged."""
+        entry = entries[i]
+        val = entry.getter(ctx) if entry.kind == "field" else None
+        selected = i == idx
+        cached = render_cache.get(i)
+        if cached is not None and cached[1] == selected and cached[0] == val:
+            return cached[2]
+        text = f"{entry.label}: {val}" if entry.kind == "field" else entry.label
+        line = item_line(
+            text,
+            selected=selected,
+            show_right_marker=(entry.kind != "action"),
+            label=_FIELD_LABELS.get(i),
+        )
+        render_cache[i] = (val, selected, line)
+        return line
+
+    def build_frame() -> None:
+        """Render the whole dashboard into `lines`."""
+        nonlocal estimate
+        if estimate is None:
+            estimate = _estimate_steps_and_time(options)
+        est_steps, est_seconds = estimate
         render_line()
         render_full_bar()
         if header_art:
             render_line()
-            print(header_art)
+            lines.extend(header_lines)
             render_header_meta()
         if est_steps > 0:
-            render_line(f"Estimated total time: {COL.wrap(_format_duration(est_seconds), COL.bold)} ({est_steps} steps)")
+            render_line(f"Estimated total time: {wrap(_format_duration(est_seconds), BOLD)} ({est_steps} steps)")
         render_full_bar()
         render_line()
-        render_line(
-            _highlight_hotkeys(
-                [
-                    "Settings (",
-                    "↑/↓",
-                    " or ",
-                    "j/k",
-                    " to navigate, ",
-                    "Enter",
-                    " to edit/run, ", 
-                    "q",
-                    " to quit)",
-                ]
-            )
-        )
+        render_line(_HOTKEY_BANNER)
         if status_msg:
-            render_line(COL.wrap(status_msg, COL.yellow))
+            render_line(wrap(status_msg, YELLOW))
         if debug_enabled:
-            render_line(COL.wrap("DEBUG MODE: Instruments disabled, synthetic sweeps active.", COL.yellow))
+            render_line(wrap("DEBUG MODE: Instruments disabled, synthetic sweeps active.", YELLOW))
         render_line()
-        
 
         for i, entry in enumerate(entries):
-            kind = entry["kind"]
+            kind = entry.kind
             if kind == "section":
                 render_line()  # blank line before each section
-                render_line(COL.wrap(f"[{entry['label']}]", COL.blue + COL.bold))
+                render_line(_SECTION_TITLES[i])
                 continue
-            if kind == "field":
-                val = entry["getter"]()
-                text = f"{entry['label']}: {val}"
-            else:
-                text = entry["label"]
-            if i == idx:
-                text = COL.wrap(text, COL.green)
-            render_item(text, selected=i == idx, show_right_marker=(kind != "action"))
+            entry_rows[i] = len(lines)
+            lines.append(entry_line(i))
         render_line()
         render_full_bar()
 
-        key = read_key()
-        if key in ("ESC[A", "k"):
-            idx = next_selectable(idx, -1)
-        elif key in ("ESC[B", "j"):
-            idx = next_selectable(idx, 1)
-        elif key in ("\r", "\n"):
-            entry = entries[idx]
-            if entry["kind"] == "field":
-                entry["setter"]()
-            elif entry["kind"] == "action":
-                if entry["action"] == "schedule":
-                    clear_screen()
-                    _render_schedule_table(options)
-                    continue
-                return options, settings, gate_settings, run_config, entry["action"]
-        elif key in ("q", "\x1b"):
-            return options, settings, gate_settings, run_config, "quit"
+    with raw_mode(sys.stdin.fileno()):
+        while True:
+            term_size = shutil.get_terminal_size()
+            if moved_from is not None and prev_lines is not None and term_size == prev_size:
+                # Navigation only: rewrite the two affected rows of the last frame.
+                lines = list(prev_lines)
+                for i in (moved_from, idx):
+                    lines[entry_rows[i]] = entry_line(i)
+                moved_from = None
+            else:
+                lines = []
+                build_frame()
+            frame = _frame_update(prev_lines, lines, term_size if term_size == prev_size else None)
+            if frame:
+                sys.stdout.write(f"{_SYNC_BEGIN}{frame}{_SYNC_END}")
+                sys.stdout.flush()
+            prev_lines = lines
+            prev_size = term_size
+
+            key = read_key(timeout=0.5)
+            while key is None and shutil.get_terminal_size() == prev_size:
+                key = read_key(timeout=0.5)
+            if key is None:
+                # Idle and the terminal was resized: repaint for the new size.
+                continue
+            # A status message is shown until the next keypress; clearing it
+            # shifts the rows below, so only patch rows when there was none.
+            layout_unchanged = status_msg is None
+            status_msg = None
+            if key in ("ESC[A", "k"):
+                moved_from = idx if layout_unchanged else None
+                pos = (pos - 1) % len(_SELECTABLE)
+                idx = _SELECTABLE[pos]
+            elif key in ("ESC[B", "j"):
+                moved_from = idx if layout_unchanged else None
+                pos = (pos + 1) % len(_SELECTABLE)
+                idx = _SELECTABLE[pos]
+            elif key in ("\r", "\n"):
+                entry = entries[idx]
+                if entry.kind == "field":
+                    with cooked_mode():
+                        error = entry.setter(ctx)
+                    if error:
+                        status_msg = error
+                    render_cache.pop(idx, None)
+                    estimate = None
+                    prev_lines = None
+                elif entry.kind == "action":
+                    if entry.action == "schedule":
+                        with cooked_mode():
+                            _render_schedule_table(options, clear=True)
+                        prev_lines = None
+                        continue
+                    return options, settings, gate_settings, run_config, entry.action
+            elif key in ("q", "\x1b"):
+                return options, settings, gate_settings, run_config, "quit"
         
@@ -1,11 +1,38 @@
 from __future__ import annotations
 
-import csv
+import errno
+import locale
+import mmap
 import os
+import sys
 import time
-from typing import Dict, List, Sequence, Any, Protocol, runtime_checkable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Any, Optional, Protocol, Tuple
 
-from ui import COL
+import numpy as np
+
+from ui import BLUE, GREEN, RESET
+
+_CSV_BUFFER_SIZE = 1 << 20
+# O_DIRECT needs page-aligned buffers and lengths.
+_DIRECT_IO_ALIGN = 4096
+_FILENAME_SAFE = str.maketrans({"+": "p", "-": "m", ".": "d"})
+_CSV_HEADER = "time_s,frequency_Hz,Re_Z_Ohm,Im_Z_Ohm,measurement_elapsed_s\r\n"
+# Fixed per-sweep metadata, rendered through one prebuilt format template.
+_COMMENT_KEYS = (
+    "voltage_V",
+    "step_index",
+    "sweep_index",
+    "time_source",
+    "timebase_dt_s",
+    "tick_start_s",
+    "tick_end_s",
+    "measurement_elapsed_s",
+)
+_COMMENT_TEMPLATE = "".join(f"# {key}: {{}}\n" for key in _COMMENT_KEYS)
+_STEP_CSV_HEADER = "time_s,frequency_Hz,Re_Z_Ohm,Im_Z_Ohm,measurement_elapsed_s,sweep_index,voltage_V\r\n"
 
 
 def build_voltage_order(
@@ -23,28 +50,213 @@ def build_voltage_order(
     if not voltages:
         raise ValueError("voltages list cannot be empty")
 
+    values = [float(v) for v in voltages]
     if not alternate_with_zero:
-        return [float(v) for _ in range(repetitions) for v in voltages]
+        return values * repetitions
 
-    sequence: List[float] = []
-    for _ in range(repetitions):
-        for v in voltages:
-            if not sequence:
-                sequence.append(0.0)
-            sequence.append(float(v))
-            sequence.append(0.0)
-    return sequence
+    # One period is 0, v1, 0, v2, ...; the closing 0 is shared by every period.
+    period: List[float] = []
+    for v in values:
+        period.append(0.0)
+        period.append(v)
+    return period * repetitions + [0.0]
 
 
 def format_seconds(seconds: float) -> str:
-    minutes = int(seconds) // 60
-    secs = int(seconds) % 60
+    # Callers pass fractional times, so cache on the whole second they display.
+    return _format_whole_seconds(int(seconds))
+
+
+@lru_cache(maxsize=1024)
+def _format_whole_seconds(seconds: int) -> str:
+    minutes, secs = divmod(seconds, 60)
     return f"{minutes:02d}:{secs:02d}"
 
 
+@lru_cache(maxsize=512)
 def sanitize_voltage_for_filename(voltage: float) -> str:
     """Create a filesystem-safe voltage label."""
-    return f"{voltage:+.3f}V".replace("+", "p").replace("-", "m").replace(".", "d")
+    return f"{voltage:+.3f}V".translate(_FILENAME_SAFE)
+
+
+_timestamp_cache: Tuple[int, str] = (-1, "")
+# Output directories already created by this process.
+_CREATED_DIRS: set[str] = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """Create path once per process instead of re-checking it on every sweep."""
+    if path not in _CREATED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _CREATED_DIRS.add(path)
+
+
+def _file_timestamp() -> str:
+    """Return the filename timestamp, formatting it at most once per wall-clock second."""
+    global _timestamp_cache
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache = (now, time.strftime("%Y%m%d-%H%M%S", time.localtime(now)))
+    return _timestamp_cache[1]
+
+
+def _comment_block(values: Sequence[Any], sweep_settings: Dict[str, Any] | None) -> str:
+    """Render the '# key: value' metadata lines for the fixed keys plus sweep_settings."""
+    if sweep_settings and not sweep_settings.keys().isdisjoint(_COMMENT_KEYS):
+        # A setting overrides a fixed key in place; keep the old dict semantics.
+        comment_lines = dict(zip(_COMMENT_KEYS, values))
+        comment_lines.update(sweep_settings)
+        return "".join([f"# {key}: {value}\n" for key, value in comment_lines.items()])
+    block = _COMMENT_TEMPLATE.format(*values)
+    if sweep_settings:
+        block += "".join([f"# {key}: {value}\n" for key, value in sweep_settings.items()])
+    return block
+
+
+def _serialize_sweep_csv(
+    comments: str,
+    time_col: Sequence[float],
+    freq: Sequence[float],
+    real: Sequence[float],
+    imag: Sequence[float],
+    measurement_elapsed: float,
+    *,
+    header: str | None = _CSV_HEADER,
+    extra: str = "",
+) -> str:
+    """Render the whole sweep file (comment metadata, header, rows) as one string.
+
+    ``header`` is skipped when None; ``extra`` is appended to every row before the line end.
+    """
+    # Numeric rows need no csv quoting; \r\n matches what csv.writer produced.
+    parts = [comments]
+    if header is not None:
+        parts.append(header)
+    # The trailing columns are the same on every row; bake them into the row template once,
+    # escaping braces so values like extra cannot be read as format fields.
+    # map() feeds the four columns straight to format, with no zip tuple per row.
+    suffix = f",{measurement_elapsed}{extra}\r\n".replace("{", "{{").replace("}", "}}")
+    row_format = ("{},{},{},{}" + suffix).format
+    parts.extend(map(row_format, time_col, freq, real, imag))
+    return "".join(parts)
+
+
+def _write_direct(path: str, data: bytes) -> bool:
+    """
+    Write data with O_DIRECT from a page-aligned buffer, bypassing the page cache.
+    Returns False when the platform or filesystem does not support it.
+    """
+    o_direct = getattr(os, "O_DIRECT", 0)
+    if not o_direct:
+        return False
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | o_direct, 0o666)
+    except OSError as exc:
+        if exc.errno == errno.EINVAL:
+            return False
+        raise
+    try:
+        size = -(-len(data) // _DIRECT_IO_ALIGN) * _DIRECT_IO_ALIGN
+        if size:
+            # Anonymous mmaps are page aligned; the tail past len(data) stays zero and is truncated below.
+            with mmap.mmap(-1, size) as buf:
+                buf.write(data)
+                view = memoryview(buf)
+                try:
+                    offset = 0
+                    while offset < size:
+                        offset += os.write(fd, view[offset:])
+                finally:
+                    view.release()
+        os.ftruncate(fd, len(data))
+    except OSError as exc:
+        if exc.errno != errno.EINVAL:
+            raise
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def _write_text(path: str, text: str, *, direct_io: bool = False) -> None:
+    """
+    Write a fully serialized file in a single call, atomically: the data goes to
+    path + ".tmp" and is renamed into place, so an interrupted run never leaves a
+    partial CSV. No fsync; durability is left to the OS writeback.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        if not (direct_io and _write_direct(tmp_path, text.encode(locale.getpreferredencoding(False)))):
+            with open(tmp_path, "w", newline="", buffering=_CSV_BUFFER_SIZE) as fh:
+                fh.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class StepCsvContext:
+    """
+    Keep one CSV open for a whole gate step so its sweeps are appended to a single file.
+
+    Pass the context to save_sweep_csv(step_file=...); each sweep adds a
+    "# ---- sweep N ----" metadata block followed by its rows, which carry
+    sweep_index and voltage_V columns. The column header is written once.
+    """
+
+    def __init__(self, output_dir: str, step_index: int, voltage: float, *, run_id: str | None = None) -> None:
+        base_prefix = f"{run_id}_" if run_id else ""
+        fname = (
+            f"{base_prefix}sweep_step{step_index + 1:02d}_"
+            f"volt_{sanitize_voltage_for_filename(voltage)}_{_file_timestamp()}.csv"
+        )
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, fname)
+        self.fh = None
+        self.header_written = False
+
+    def write(self, text: str) -> None:
+        """Append one sweep and flush it, so a killed run keeps the step's earlier sweeps."""
+        if self.fh is None:
+            raise RuntimeError("StepCsvContext is not open.")
+        self.fh.write(text)
+        self.fh.flush()
+
+    def __enter__(self) -> "StepCsvContext":
+        _ensure_dir(self.output_dir)
+        self.fh = open(self.path, "w", newline="", buffering=_CSV_BUFFER_SIZE)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        fh, self.fh = self.fh, None
+        if fh is not None:
+            fh.close()
+
+
+# Per-sweep files are written in the background so the next sweep can start while bytes flush.
+_WRITER_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sweep-csv")
+_PENDING_WRITES: List[Future] = []
+
+
+def _reap_writes(wait: bool) -> None:
+    """Drop finished background writes, re-raising the first failure."""
+    global _PENDING_WRITES
+    pending = _PENDING_WRITES
+    if wait:
+        for future in pending:
+            future.exception()
+    _PENDING_WRITES = [future for future in pending if not future.done()]
+    for future in pending:
+        if future.done() and future.exception() is not None:
+            raise future.exception()
+
+
+def flush_pending() -> None:
+    """Block until every queued sweep CSV is on disk; raise the first write error, if any."""
+    _reap_writes(wait=True)
 
 
 def save_sweep_csv(
@@ -58,53 +270,98 @@ def save_sweep_csv(
     timebase_dt: float | None = None,
     sweep_settings: Dict[str, Any] | None = None,
     run_id: str | None = None,
+    step_file: StepCsvContext | None = None,
+    direct_io: bool = False,
+    sync: bool = False,
 ) -> str:
-    """Save a single sweep to CSV with time, frequency, Re(Z), Im(Z)."""
+    """
+    Save a single sweep to CSV with time, frequency, Re(Z), Im(Z).
+
+    With step_file, the sweep is appended to that step's shared CSV instead of
+    getting its own file; the shared file's path is returned. direct_io writes
+    per-sweep files with O_DIRECT where supported (Linux), else buffered.
+
+    Per-sweep files are written on a background thread unless sync=True; call
+    flush_pending() at the end of a run to wait for them and surface errors.
+    """
     freq = data["frequency_Hz"]
     real = data["Re_Z_Ohm"]
     imag = data["Im_Z_Ohm"]
-    time_col = data.get("time_s_raw") or [measurement_elapsed] * len(freq)
+    time_col = data.get("time_s_raw")
     time_source = data.get("time_s_source", "measurement_elapsed")
     ticks = data.get("time_ticks_raw")
+    if (time_col is None or len(time_col) == 0) and ticks and timebase_dt and len(ticks) == len(freq):
+        # Ticks were stored unconverted: derive relative seconds in one vectorized pass.
+        tick_arr = np.asarray(ticks, dtype=np.float64)
+        time_col = (tick_arr - tick_arr[0]) * timebase_dt
+        time_source = "ticks"
+    if time_col is None or len(time_col) == 0:
+        time_col = [measurement_elapsed] * len(freq)
+    elif hasattr(time_col, "tolist"):
+        # Array time columns format faster as plain floats than as numpy scalars.
+        time_col = time_col.tolist()
     tick_start_sec = tick_end_sec = None
     if ticks and timebase_dt:
         tick_start_sec = ticks[0] * timebase_dt
         tick_end_sec = ticks[-1] * timebase_dt
 
-    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    comments = _comment_block(
+        (
+            voltage,
+            step_index,
+            sweep_index,
+            time_source,
+            timebase_dt,
+            tick_start_sec,
+            tick_end_sec,
+            measurement_elapsed,
+        ),
+        sweep_settings,
+    )
+
+    if step_file is not None:
+        text = _serialize_sweep_csv(
+            comments,
+            time_col,
+            freq,
+            real,
+            imag,
+            measurement_elapsed,
+            header=None if step_file.header_written else _STEP_CSV_HEADER,
+            extra=f",{sweep_index},{voltage}",
+        )
+        step_file.write(f"# ---- sweep {sweep_index} ----\n{text}")
+        step_file.header_written = True
+        print(f"Appended sweep {sweep_index} to {step_file.path}")
+        return step_file.path
+
+    text = _serialize_sweep_csv(comments, time_col, freq, real, imag, measurement_elapsed)
+    timestamp = _file_timestamp()
     base_prefix = f"{run_id}_" if run_id else ""
     fname = (
         f"{base_prefix}sweep_step{step_index + 1:02d}_sweep{sweep_index:02d}_"
         f"volt_{sanitize_voltage_for_filename(voltage)}_{timestamp}.csv"
     )
-    os.makedirs(output_dir, exist_ok=True)
+    _ensure_dir(output_dir)
     path = os.path.join(output_dir, fname)
-    with open(path, "w", newline="") as fh:
-        # Comment metadata header
-        comment_lines = {
-            "voltage_V": voltage,
-            "step_index": step_index,
-            "sweep_index": sweep_index,
-            "time_source": time_source,
-            "timebase_dt_s": timebase_dt,
-            "tick_start_s": tick_start_sec,
-            "tick_end_s": tick_end_sec,
-            "measurement_elapsed_s": measurement_elapsed,
-        }
-        if sweep_settings:
-            comment_lines.update(sweep_settings)
-        for key, value in comment_lines.items():
-            fh.write(f"# {key}: {value}\n")
-
-        writer = csv.writer(fh)
-        writer.writerow(["time_s", "frequency_Hz", "Re_Z_Ohm", "Im_Z_Ohm", "measurement_elapsed_s"])
-        for idx, (t, f, r, im) in enumerate(zip(time_col, freq, real, imag)):
-            writer.writerow([t, f, r, im, measurement_elapsed])
-    print(f"Saved sweep to {path}")
+    if sync:
+        _write_text(path, text, direct_io=direct_io)
+        print(f"Saved sweep to {path}")
+        return path
+    # Queue this sweep first so its data is never dropped, then surface
+    # failures from earlier sweeps.
+    _PENDING_WRITES.append(_WRITER_POOL.submit(_write_text, path, text, direct_io=direct_io))
+    print(f"Queued sweep for {path}")
+    _reap_writes(wait=False)
     return path
 
 
-@runtime_checkable
+# Gate messages change with every voltage, so they are colored through prebuilt
+# templates rather than the cached wrap() helper.
+_GATE_SET_LINE = f"{GREEN}[Gate source] Setting gate to {{:g}} V{RESET}\n"
+_GATE_MEASURED_LINE = f"{BLUE}Measured gate: {{:.6g}} V, {{:.3e}} A{RESET}\n"
+
+
 class GateVoltageSource(Protocol):
     """Duck-typed voltage source with voltage set + optional wait."""
 
@@ -112,6 +369,20 @@ class GateVoltageSource(Protocol):
     def set_voltage_and_wait(self, voltage: float, tolerance_v: float, timeout_s: float = 10.0) -> tuple[float, float]: ...
 
 
+@dataclass(frozen=True)
+class _SourceMethods:
+    """A gate source class's methods, resolved once; called with the source as first argument."""
+
+    set_voltage: Callable[[GateVoltageSource, float], None]
+    set_voltage_and_wait: Optional[Callable[[GateVoltageSource, float, float, float], tuple[float, float]]]
+
+
+@lru_cache(maxsize=None)
+def _bind_source(source_type: type) -> _SourceMethods:
+    """Resolve set_voltage and set_voltage_and_wait (or None) once per source class."""
+    return _SourceMethods(source_type.set_voltage, getattr(source_type, "set_voltage_and_wait", None))
+
+
 def set_gate_voltage(
     voltage: float,
     source: GateVoltageSource | None = None,
@@ -122,15 +393,17 @@ def set_gate_voltage(
     """
     Set the gate voltage using the provided source, falling back to a log message.
     """
-    message = f"[Gate source] Setting gate to {voltage:g} V"
-    print(COL.wrap(message, COL.green))
+    # sys.stdout is looked up per call: run logging swaps in a Tee.
+    sys.stdout.write(_GATE_SET_LINE.format(voltage))
     if source is not None:
-        if tolerance_v is not None and hasattr(source, "set_voltage_and_wait"):
-            meas_v, meas_i = source.set_voltage_and_wait(voltage, tolerance_v, timeout_s or 10.0)
-            print(COL.wrap(f"Measured gate: {meas_v:.6g} V, {meas_i:.3e} A", COL.blue))
+        # Keyed on the class, not the instance, so no source object is kept alive.
+        methods = _bind_source(type(source))
+        if tolerance_v is not None and methods.set_voltage_and_wait is not None:
+            meas_v, meas_i = methods.set_voltage_and_wait(source, voltage, tolerance_v, timeout_s or 10.0)
+            sys.stdout.write(_GATE_MEASURED_LINE.format(meas_v, meas_i))
             return meas_v, meas_i
         else:
-            source.set_voltage(voltage)
+            methods.set_voltage(source, voltage)
             meas_v = meas_i = None
     else:
         meas_v = meas_i = None